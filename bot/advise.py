@@ -0,0 +1,146 @@
+from collections import OrderedDict
+import json
+import sys
+from typing import Iterable, Iterator
+
+from entropy import GameState, Solver, make_parser
+from opening import load_opening_book
+from policy import load_policy
+from utils import str_to_pattern
+
+# States remembered by default; the least recently used is dropped beyond this
+MEMO_SIZE = 100_000
+
+
+def parse_history(record) -> list[tuple[str, int]]:
+    """
+    The (guess, code) pairs of one record: either a list of [guess, pattern]
+    pairs or an object with a "history" list. A pattern is a feedback code or
+    a string as typed into main.py (g green, y yellow, x gray).
+    """
+
+    history = record.get("history") if isinstance(record, dict) else record
+    if not isinstance(history, list):
+        raise ValueError("record is not a history list or an object with one")
+
+    pairs = []
+    for entry in history:
+        if not isinstance(entry, (list, tuple)) or len(entry) != 2:
+            raise ValueError(f"history entry {entry!r} is not a [guess, pattern] pair")
+        guess, pattern = str(entry[0]).lower(), entry[1]
+        if not guess.isascii() or not guess.isalpha():
+            raise ValueError(f"guess {guess!r} is not a word of letters a-z")
+        if isinstance(pattern, str):
+            code = str_to_pattern(pattern, len(guess))
+        elif isinstance(pattern, int) and 0 <= pattern < 3 ** len(guess):
+            code = pattern
+        else:
+            raise ValueError(f"invalid pattern {pattern!r}")
+        pairs.append((guess, code))
+    return pairs
+
+
+def constraint_key(game: GameState) -> tuple:
+    """A hashable key for the constraints of a game; equal keys filter the word list identically."""
+    return (
+        tuple(sorted(game.green.items())),
+        tuple(sorted((letter, tuple(sorted(positions))) for letter, positions in game.yellow.items())),
+        tuple(sorted(game.gray)),
+        tuple(sorted((letter, count) for letter, count in game.min_required.items() if count > 0)),
+    )
+
+
+class AdviceStats:
+    def __init__(self):
+        self.records = 0
+        self.computed = 0  # next_guess calls
+        self.memo_hits = 0
+        self.errors = 0
+
+
+def advise(records: Iterable, solver: Solver, memo_size: int = MEMO_SIZE, stats: AdviceStats | None = None) -> Iterator[dict]:
+    """
+    For every record (see parse_history), replay its history as main.py does
+    and yield the number of candidates left, the recommended next guess and its
+    entropy. Results are memoized by constraint set in an LRU of memo_size states,
+    so memory stays bounded however many records stream through.
+    """
+
+    if stats is None:
+        stats = AdviceStats()
+    memo = OrderedDict()
+
+    for record in records:
+        stats.records += 1
+        result = {"id": record["id"]} if isinstance(record, dict) and "id" in record else {}
+
+        try:
+            game = solver.new_game()
+            for guess, code in parse_history(record):
+                if len(guess) != solver.table.length:
+                    raise ValueError(f"guess {guess!r} does not have {solver.table.length} letters")
+                game.apply(guess, code)
+        except ValueError as error:
+            stats.errors += 1
+            result["error"] = str(error)
+            yield result
+            continue
+
+        key = constraint_key(game)
+        advice = memo.get(key)
+        if advice is not None:
+            stats.memo_hits += 1
+            memo.move_to_end(key)
+        else:
+            remaining = solver.filter_ids(game.ids, game.green, game.yellow, game.gray, min_required=game.min_required)
+            if not len(remaining):
+                advice = {"remaining": 0, "error": "no valid words remaining with the given constraints"}
+            else:
+                stats.computed += 1
+                guess, ent = game.next_guess()
+                advice = {"remaining": len(game.ids), "guess": guess, "entropy": ent}
+            memo[key] = advice
+            if len(memo) > memo_size:
+                memo.popitem(last=False)
+
+        if "error" in advice:
+            stats.errors += 1
+        result.update(advice)
+        yield result
+
+
+def read_records(lines: Iterable[str]) -> Iterator:
+    """Parse a JSONL stream lazily, skipping blank lines; unparsable lines yield None (reported as errors)."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield None
+
+
+if __name__ == '__main__':
+
+    parser = make_parser("Recommend the next guess for every game history in a JSONL stream")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of histories (default: stdin)")
+    parser.add_argument("-o", "--output", type=str, default="-", help="Where to write JSONL advice (default: stdout)")
+    parser.add_argument("--memo-size", type=int, default=MEMO_SIZE, help="States remembered between records")
+    parser.add_argument("--policy", type=str, default=None, help="Policy tree built by policy.py (default: next to the word list)")
+    parser.add_argument("--opening-book", type=str, default=None, help="Opening book built by opening.py (default: next to the word list)")
+    args = parser.parse_args()
+
+    solver = Solver.from_args(args)
+    solver.verbose = False
+    solver.policy = load_policy(solver, args.policy)
+    solver.opening_book = load_opening_book(solver, args.opening_book)
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    stats = AdviceStats()
+    try:
+        for advice in advise(read_records(source), solver, memo_size=args.memo_size, stats=stats):
+            sink.write(json.dumps(advice) + "\n")
+    finally:
+        sink.flush()
+        print(f"{stats.records} records, {stats.computed} states computed, {stats.memo_hits} memo hits, {stats.errors} errors", file=sys.stderr)
@@ -7,19 +7,75 @@ import pytesseract
 
 from pynput.keyboard import Controller, Key
 
-from entropy import WORDS, next_guess, update_colours
+import board
+import glyphs
+import instrument
+from entropy import Solver, make_parser
+from opening import load_opening_book
+from policy import load_policy
+
+# The Wordle game area on screen (left, top, width, height)
+REGION = (960, 400, 360, 430)
+
+# Screen point of the end-of-game dialog's next-game button, and the seconds
+# the dialog takes to appear after the winning row has settled
+NEXT_GAME_BUTTON = (1000, 850)
+WIN_DIALOG_DELAY = 2.0
 
 def screenshot_wordle():
     """
     Takes a screenshot of the Wordle game area.
     Returns a PIL Image object.
     """
-    # Define the region to capture (left, top, width, height)
-    region = (960, 400, 360, 430)
-    screenshot = pyautogui.screenshot(region=region)
+    screenshot = pyautogui.screenshot(region=REGION)
     return screenshot
 
-def extract_wordle_grid(image):
+def grab_row(row: int) -> np.ndarray:
+    """
+    Takes a screenshot of one row of the Wordle grid only.
+    Returns it as an RGB array, laid out as board.tile_means expects.
+    """
+    left, top, width, _ = REGION
+    return np.asarray(pyautogui.screenshot(region=(left, top + row * board.TILE_PITCH, width, board.TILE_PITCH)))
+
+def extract_wordle_grid(image, templates: glyphs.GlyphTemplates | None = None):
+    """
+    Extracts Wordle letters by matching each tile against learned glyph templates,
+    reading only low-confidence tiles with OCR. Without templates the whole board
+    goes through OCR.
+    """
+
+    if templates is not None:
+        grid, confidences = glyphs.read_letters(image, templates, fallback=ocr_tile)
+        low = sum(score < glyphs.MIN_CONFIDENCE for row in confidences for score in row)
+        if low:
+            print(f"Read {low} uncertain tiles with OCR")
+        return grid
+
+    return ocr_wordle_grid(image)
+
+def ocr_tile(image, row: int, col: int) -> str | None:
+    """
+    Reads a single tile's letter using OCR.
+    """
+
+    config = (
+        "--oem 3 "
+        "--psm 10 "
+        "-c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    )
+
+    tile = np.asarray(image)[..., :3]
+    left, top, right, bottom = glyphs.tile_box(row, col)
+    tile = cv2.cvtColor(np.ascontiguousarray(tile[top:bottom, left:right]), cv2.COLOR_RGB2GRAY)
+    tile = cv2.resize(tile, (tile.shape[1] * 2, tile.shape[0] * 2))
+    _, tile = cv2.threshold(tile, 175, 255, cv2.THRESH_BINARY)
+
+    text = pytesseract.image_to_string(tile, config=config)
+    letters = [char for char in text if char.isalpha()]
+    return letters[0] if letters else None
+
+def ocr_wordle_grid(image):
     """
     Extracts Wordle letters using OCR.
     """
@@ -59,33 +115,29 @@ def extract_wordle_grid(image):
     
     return grid
 
-def get_colours(grid, image):
+def get_colours(grid, image, reader: board.BoardReader | None = None):
     """
     Analyzes the screenshot to determine the colours of the letters in the Wordle grid.
     Returns a list of lists representing the colours (e.g., 'green', 'yellow', 'gray').
+    Pass the game's BoardReader to only sample rows it has not resolved yet.
+    """
+
+    if reader is None:
+        reader = board.BoardReader()
+
+    # Unrevealed tiles read as gray, as the dark board background always has
+    colours = reader.read(image, len(grid))
+    return [[colour or 'gray' for colour in row] for row in colours]
+
+def colours_to_code(row_colours) -> int:
+    """
+    Converts one row of tile colours to its base-3 feedback code (2=green, 1=yellow, 0=gray).
     """
 
-    pixels = []
-    for row in range(len(grid)):
-        for col in range(len(grid[row])):
-            x = 20 + col * 70
-            y = 20 + row * 70
-            pixel = image.getpixel((x, y))
-            pixels.append(pixel[:-1])  # Ignore alpha channel
-
-    # Determine the colour of each letter
-    colours = []
-    for pixel in pixels:
-        # Estimate the colour based on the pixel value
-        avg = sum(pixel) / 3
-        if avg < 75:  # dark
-            colours.append('gray')
-        else:  # light
-            colours.append('green' if pixel[1] > pixel[0] and pixel[1] > pixel[2] else 'yellow')
-
-    # Reshape the colours list to match the grid
-    colours = [colours[i:i+len(grid[0])] for i in range(0, len(colours), len(grid[0]))]
-    return colours
+    code = 0
+    for colour in row_colours:
+        code = code * 3 + {'green': 2, 'yellow': 1}.get(colour, 0)
+    return code
 
 def letters_colours_to_gxy(grid, colours) -> tuple[list[tuple[str, int]], list[tuple[str, int]], list[tuple[str, int]]]:
     """
@@ -110,52 +162,90 @@ def letters_colours_to_gxy(grid, colours) -> tuple[list[tuple[str, int]], list[t
     
     return (green, yellow, gray)
 
-def main():
+def main(solver: Solver, time_budget: float | None = None, templates: glyphs.GlyphTemplates | None = None):
 
     keyboard = Controller()
 
     while True:
 
-        possible_words = WORDS.copy()
-        green = {}
-        yellow = {}
-        gray = set()
-        min_required = {}
+        game = solver.new_game()
+        instrument.begin_game()
 
         grid = []
+        colours = []
+        reader = board.BoardReader()
 
-        # screenshot = screenshot_wordle()
-        # grid = extract_wordle_grid(screenshot)
-        # print("Existing letters:", grid)
+        # resume a partially played board (reading it with OCR alone is too slow)
+        if templates is not None:
+            screenshot = screenshot_wordle()
+            with instrument.timed("letter_reading"):
+                grid = extract_wordle_grid(screenshot, templates)
+            print("Existing letters:", grid)
 
-        # if grid:
-        #     colours = get_colours(grid, screenshot)
-        #     new_green, new_yellow, new_gray = letters_colours_to_gxy(grid, colours)
-        #     green, yellow, gray, min_required = update_colours(new_green, new_yellow, new_gray, green, yellow, gray, min_required)
+            if grid:
+                colours = get_colours(grid, screenshot, reader)
+                game.update(*letters_colours_to_gxy(grid, colours))
+                for letters, row_colours in zip(grid, colours):
+                    game.history.append(("".join(letters).lower(), colours_to_code(row_colours)))
 
 
         while True:
-            guess, ent, possible_words = next_guess(possible_words, green, yellow, gray, min_required=min_required, show_progress=True)
-            print(f"Next guess: {guess} (Entropy: {ent:.4f}, Possible words left: {len(possible_words)})\n")
+            instrument.begin_turn()
+            guess, ent = game.next_guess(show_progress=True, time_budget=time_budget)
+            if not solver.last_search.completed:
+                print(f"Time budget reached after {solver.last_search.evaluated}/{solver.last_search.candidates} candidates")
+            print(f"Next guess: {guess} (Entropy: {ent:.4f}, Possible words left: {len(game.ids)})\n")
 
             # send guess to Wordle
             keyboard.type(guess)
             keyboard.press(Key.enter)
             keyboard.release(Key.enter)
-            time.sleep(3)
 
-            # update colours and grid
+            # read the new row as soon as its tiles have finished flipping
+            row = len(grid)
             grid.append([char.upper() for char in guess])
-            screenshot = screenshot_wordle()
-            colours = get_colours(grid, screenshot)
+            with instrument.timed("row_polling"):
+                reading = board.poll_row(lambda: grab_row(row), classifier=reader.classifier)
+            print(f"Row settled after {reading.latency:.2f}s ({reading.frames} frames)")
+            if instrument.enabled:
+                # Every polled frame is a row screenshot and a colour read
+                instrument.add_time("screenshot", reading.grab_seconds)
+                instrument.count("screenshot", reading.frames)
+                instrument.add_time("colour_detection", reading.classify_seconds)
+                instrument.count("colour_detection", reading.frames)
+
+            if reading.stable:
+                colours.append(reading.colours)
+            else:
+                # never settled: read the whole board as it is now
+                print("Row did not settle; reading the whole board")
+                with instrument.timed("screenshot"):
+                    screenshot = screenshot_wordle()
+                with instrument.timed("colour_detection"):
+                    colours = get_colours(grid, screenshot, reader)
             new_green, new_yellow, new_gray = letters_colours_to_gxy(grid, colours)
-            green, yellow, gray, min_required = update_colours(new_green, new_yellow, new_gray, green, yellow, gray, min_required)
-
-            if len(possible_words) == 1:
-                time.sleep(2)
-                pyautogui.click(1000, 850)
+            game.update(new_green, new_yellow, new_gray)
+            game.history.append((guess, colours_to_code(colours[-1])))
+            instrument.end_turn(guess=guess, remaining=len(game.ids), flip_ms=round(reading.latency * 1000, 1))
+
+            if len(game.ids) == 1:
+                instrument.end_game(guesses=len(game.history))
+                # The end-of-game dialog fades in on a fixed timer after the winning row
+                # has settled, and nothing on the board changes to say it has arrived
+                time.sleep(WIN_DIALOG_DELAY)
+                pyautogui.click(*NEXT_GAME_BUTTON)
                 break
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = make_parser()
+    parser.add_argument("--policy", type=str, default=None, help="Policy tree built by policy.py (default: next to the word list)")
+    parser.add_argument("--opening-book", type=str, default=None, help="Opening book built by opening.py (default: next to the word list)")
+    parser.add_argument("--time-budget", type=float, default=None, help="Seconds a turn may spend searching before returning its best guess so far")
+    parser.add_argument("--glyphs", type=str, default=glyphs.GLYPHS, help="Glyph templates built by glyphs.py (needed to resume a partially played board)")
+    args = parser.parse_args()
+
+    solver = Solver.from_args(args)
+    solver.policy = load_policy(solver, args.policy)
+    solver.opening_book = load_opening_book(solver, args.opening_book)
+    main(solver, time_budget=args.time_budget, templates=glyphs.GlyphTemplates.load(args.glyphs))
@@ -0,0 +1,256 @@
+import contextlib
+import io
+import json
+import platform
+import random as rnd
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from entropy import Solver, entropy, feedback, feedback_code, is_guess_valid, make_parser
+from patterns import word_list_hash
+from skilltest import play
+
+# Bumped whenever a benchmark's workload changes, so old baselines are not compared against it
+BENCH_VERSION = 1
+
+# Each benchmark runs this many times and keeps its fastest run
+REPEAT = 3
+
+# Allowed relative slowdown (or peak memory growth) before compare reports a regression
+THRESHOLD = 0.20
+
+
+####################################################################################################
+# WORKLOADS
+# Every workload is built up front from the word list and seed, then timed as a
+# function returning the number of calls it made.
+
+def _quiet_states(solver: Solver, answers: list[str]) -> dict[str, list]:
+    """
+    Play each answer as main.py would and collect the states next_guess is
+    called in, bucketed into early (turn 2), middle (turn 3) and late turns.
+    """
+
+    states = {"early": [], "middle": [], "late": []}
+    for answer in answers:
+        game = solver.new_game()
+        for turn in range(1, 10):
+            if turn > 1:
+                bucket = "early" if turn == 2 else "middle" if turn == 3 else "late"
+                states[bucket].append((game.ids, game.green.copy(), {k: set(v) for k, v in game.yellow.items()}, game.gray.copy(), dict(game.min_required)))
+            try:
+                guess, _ = game.next_guess()
+            except SystemExit:
+                break
+            if guess == answer or len(game.ids) <= 1:
+                break
+            game.apply(guess, feedback_code(guess, answer))
+    return states
+
+
+def workloads(solver: Solver, seed: int = 0, games: int = 10) -> dict:
+    """The benchmark functions for a solver's word list, keyed by name."""
+
+    rng = rnd.Random(seed)
+    words = solver.words
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(2000)]
+    answers = rng.sample(words, min(len(words), 200))
+    guesses = rng.sample(words, min(len(words), 20))
+    game_answers = rng.sample(words, min(len(words), games))
+
+    solver.verbose = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        states = _quiet_states(solver, game_answers)
+    constraints = [state[1:] for bucket in states.values() for state in bucket][:20]
+
+    def bench_feedback():
+        for guess, answer in pairs:
+            feedback(guess, answer)
+        return len(pairs)
+
+    def bench_entropy():
+        for guess in guesses:
+            entropy(guess, answers)
+        return len(guesses)
+
+    def bench_solver_entropy():
+        for guess in guesses:
+            solver.entropy(guess, answers)
+        return len(guesses)
+
+    def bench_is_guess_valid():
+        for green, yellow, gray, min_required in constraints:
+            for word in answers:
+                is_guess_valid(word, green, yellow, gray, min_required)
+        return len(constraints) * len(answers)
+
+    def bench_filter_words():
+        for green, yellow, gray, min_required in constraints:
+            solver.filter_words(words, green, yellow, gray, min_required=min_required)
+        return len(constraints)
+
+    def bench_next_guess(bucket):
+        def run():
+            for ids, green, yellow, gray, min_required in states[bucket]:
+                solver.next_guess_ids(ids, green, yellow, gray, min_required=min_required)
+            return len(states[bucket])
+        return run
+
+    def bench_play():
+        played = 0
+        for answer in game_answers:
+            try:
+                play(answer, solver, verbose=False)
+                played += 1
+            except SystemExit:
+                pass
+        return played
+
+    benchmarks = {
+        "feedback": bench_feedback,
+        "entropy": bench_entropy,
+        "solver.entropy": bench_solver_entropy,
+        "is_guess_valid": bench_is_guess_valid,
+        "filter_words": bench_filter_words,
+        "next_guess.early": bench_next_guess("early"),
+        "next_guess.middle": bench_next_guess("middle"),
+        "next_guess.late": bench_next_guess("late"),
+        "skilltest.play": bench_play,
+    }
+    return benchmarks
+
+
+####################################################################################################
+# RUN AND COMPARE
+
+def measure(fn, repeat: int = REPEAT) -> dict:
+    """Time fn (which returns its number of calls) as the best of repeat runs, then once more for peak memory."""
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            calls = fn()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "calls": calls,
+        "seconds": best,
+        "calls_per_second": calls / best if best > 0 else float("inf"),
+        "peak_kib": peak / 1024,
+    }
+
+
+def run_benchmarks(solver: Solver, seed: int = 0, games: int = 10, repeat: int = REPEAT, only: list[str] | None = None) -> dict:
+    """Run every benchmark (or those named in only) and return the results with the run's settings."""
+
+    # Build the pattern matrix and index outside the timed runs
+    solver.patterns, solver.index
+
+    results = {}
+    for name, fn in workloads(solver, seed, games).items():
+        if only and name not in only:
+            continue
+        results[name] = measure(fn, repeat)
+
+    return {
+        "meta": {
+            "version": BENCH_VERSION, "word_hash": word_list_hash(solver.words), "seed": seed, "games": games,
+            "python": platform.python_version(), "numpy": np.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = THRESHOLD, memory_threshold: float | None = None) -> list[str]:
+    """
+    Compare two run_benchmarks results and return a line per regression: a
+    benchmark whose calls per second fell, or whose peak memory grew, by more
+    than the threshold. Raises ValueError if the runs are not comparable.
+    """
+
+    if memory_threshold is None:
+        memory_threshold = threshold
+
+    for field in ("version", "word_hash", "seed", "games"):
+        if baseline["meta"][field] != current["meta"][field]:
+            raise ValueError(f"baseline and current runs differ in {field}: {baseline['meta'][field]!r} vs {current['meta'][field]!r}")
+
+    regressions = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        slowdown = base["calls_per_second"] / now["calls_per_second"] - 1
+        if slowdown > threshold:
+            regressions.append(f"{name}: {now['calls_per_second']:.1f} calls/s vs {base['calls_per_second']:.1f} ({slowdown:+.0%} time)")
+        growth = now["peak_kib"] / max(base["peak_kib"], 1) - 1
+        if growth > memory_threshold:
+            regressions.append(f"{name}: peak {now['peak_kib']:.0f} KiB vs {base['peak_kib']:.0f} KiB ({growth:+.0%} memory)")
+    return regressions
+
+
+def print_results(run: dict, baseline: dict | None = None) -> None:
+    print(f"{'benchmark':<18} {'calls':>6} {'seconds':>9} {'calls/s':>11} {'peak KiB':>9}" + (f" {'vs base':>8}" if baseline else ""))
+    for name, result in run["results"].items():
+        line = f"{name:<18} {result['calls']:>6} {result['seconds']:>9.4f} {result['calls_per_second']:>11.1f} {result['peak_kib']:>9.0f}"
+        if baseline and name in baseline["results"]:
+            line += f" {result['calls_per_second'] / baseline['results'][name]['calls_per_second']:>7.2f}x"
+        print(line)
+
+
+if __name__ == '__main__':
+
+    parser = make_parser("Benchmark the solver hot paths and compare against a baseline")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the sampled guesses, answers and games")
+    parser.add_argument("--games", type=int, default=10, help="Games played by the next_guess and skilltest benchmarks")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Runs per benchmark (the fastest is kept)")
+    parser.add_argument("--only", nargs="*", default=None, help="Benchmarks to run (default: all)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks, optionally saving them as a baseline")
+    run.add_argument("-o", "--output", type=str, default=None, help="Write the results to this JSON file")
+
+    check = commands.add_parser("compare", help="Fail if any benchmark regressed against a baseline")
+    check.add_argument("baseline", help="Baseline JSON written by run -o")
+    check.add_argument("current", nargs="?", default=None, help="Results to check (default: run the benchmarks now)")
+    check.add_argument("--threshold", type=float, default=THRESHOLD, help="Allowed relative slowdown")
+    check.add_argument("--memory-threshold", type=float, default=None, help="Allowed relative peak memory growth (default: --threshold)")
+
+    args = parser.parse_args()
+    solver = Solver.from_args(args)
+
+    if args.command == "run":
+        results = run_benchmarks(solver, args.seed, args.games, args.repeat, args.only)
+        print_results(results)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2)
+            print(f"Saved baseline to {args.output}")
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if args.current:
+            with open(args.current) as file:
+                current = json.load(file)
+        else:
+            current = run_benchmarks(solver, baseline["meta"]["seed"], baseline["meta"]["games"], args.repeat, args.only)
+        print_results(current, baseline)
+
+        regressions = compare(baseline, current, args.threshold, args.memory_threshold)
+        for line in regressions:
+            print("REGRESSION", line)
+        sys.exit(1 if regressions else 0)
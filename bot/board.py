@@ -0,0 +1,279 @@
+import json
+import os
+import time
+from typing import Callable, Iterable
+
+import numpy as np
+
+# Board geometry inside the screenshot taken by auto.screenshot_wordle:
+# the first tile is sampled at (ORIGIN, ORIGIN) and tiles repeat every TILE_PITCH pixels
+ORIGIN = 20
+TILE_PITCH = 70
+COLUMNS = 5
+
+# Labelled board screenshots for measuring the reader offline (see evaluate_fixtures)
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "boards")
+
+# Pixels averaged on each side of a tile's sample point (a (2r+1) x (2r+1) patch)
+PATCH_RADIUS = 3
+
+# Reference RGB of each tile colour (dark theme); a tile takes the nearest one.
+# None is an unrevealed tile (the empty board background).
+CENTROIDS = {
+    "green": (83, 141, 78),
+    "yellow": (181, 159, 59),
+    "gray": (58, 58, 60),
+    None: (18, 18, 19),
+}
+
+
+####################################################################################################
+# TILE COLOURS
+
+def tile_means(image, first_row: int = 0, rows: int = 1, columns: int = COLUMNS, radius: int = PATCH_RADIUS) -> np.ndarray:
+    """
+    The mean RGB of a patch around the sample point of every tile in rows
+    first_row.. of a board image (a screenshot or array), as a (rows, columns, 3) array.
+    """
+
+    pixels = np.asarray(image)
+    offsets = np.arange(-radius, radius + 1)
+    ys = ORIGIN + (first_row + np.arange(rows))[:, None] * TILE_PITCH + offsets
+    xs = ORIGIN + np.arange(columns)[:, None] * TILE_PITCH + offsets
+    patches = pixels[ys[:, None, :, None], xs[None, :, None, :], :3]
+    return patches.mean(axis=(2, 3))
+
+
+class ColourClassifier:
+    """Labels tiles by the nearest colour centroid, all tiles at once."""
+
+    def __init__(self, centroids: dict | None = None):
+        centroids = CENTROIDS if centroids is None else centroids
+        self.labels = np.array(list(centroids), dtype=object)
+        self.centroids = np.array(list(centroids.values()), dtype=np.float64)
+
+    def classify(self, means: np.ndarray) -> list:
+        """Colour names (None for unrevealed tiles) for an array of tile means, keeping its shape."""
+        means = np.asarray(means, dtype=np.float64)
+        distances = ((means[..., None, :] - self.centroids) ** 2).sum(axis=-1)
+        return self.labels[distances.argmin(axis=-1)].tolist()
+
+
+class BoardReader:
+    """
+    Reads a board's tile colours from screenshots. Rows that have been read
+    with every tile revealed cannot change again during a game, so they are
+    kept and only newer rows are sampled on later reads. Use one per game.
+    """
+
+    def __init__(self, classifier: ColourClassifier | None = None):
+        self.classifier = classifier or ColourClassifier()
+        self.rows = []
+
+    def read(self, image, rows: int) -> list[list]:
+        """The colours of the first rows rows of the board in image."""
+
+        resolved = len(self.rows)
+        if rows <= resolved:
+            return self.rows[:rows]
+
+        new = self.classifier.classify(tile_means(image, resolved, rows - resolved))
+        for row in new:
+            if None in row:
+                break
+            self.rows.append(row)
+        return self.rows[:resolved] + new
+
+
+####################################################################################################
+# STABILITY
+# After a guess is entered, the row's tiles flip one after another. Instead of
+# sleeping for the longest flip, the row is read repeatedly and accepted once
+# every tile is revealed and nothing changes over a few consecutive frames.
+
+# Consecutive identical frames needed before a row counts as settled
+STABLE_FRAMES = 2
+
+# Largest per-channel change between frames still counted as identical
+TOLERANCE = 12
+
+# Seconds between frames while polling, and before giving up
+POLL_INTERVAL = 0.05
+POLL_TIMEOUT = 5.0
+
+
+class StabilityDetector:
+    """Fed one row's tile means per frame; settled once the row has stopped changing."""
+
+    def __init__(self, frames: int = STABLE_FRAMES, tolerance: int = TOLERANCE, classifier: ColourClassifier | None = None):
+        self.frames = frames
+        self.tolerance = tolerance
+        self.classifier = classifier or ColourClassifier()
+        self.previous = None
+        self.run = 0
+        self.colours = None
+
+    def feed(self, means: np.ndarray) -> bool:
+        """Add a frame's (columns, 3) tile means; returns whether the row has settled."""
+
+        colours = self.classifier.classify(means)
+
+        if None in colours:
+            self.run = 0
+        elif (self.previous is not None and colours == self.colours
+                and np.abs(means - self.previous).max() <= self.tolerance):
+            self.run += 1
+        else:
+            self.run = 1
+
+        self.previous, self.colours = means, colours
+        return self.run >= self.frames
+
+
+class RowReading:
+    """
+    What polling a row saw: its colours (None if it never settled), frames read
+    and seconds waited, of which grab_seconds went to grabbing frames and
+    classify_seconds to reading their colours.
+    """
+
+    def __init__(self, colours: list[str] | None, frames: int, latency: float, grab_seconds: float = 0.0, classify_seconds: float = 0.0):
+        self.colours = colours
+        self.frames = frames
+        self.latency = latency
+        self.grab_seconds = grab_seconds
+        self.classify_seconds = classify_seconds
+
+    @property
+    def stable(self) -> bool:
+        return self.colours is not None
+
+
+def settle(frames: Iterable[np.ndarray], stable_frames: int = STABLE_FRAMES, tolerance: int = TOLERANCE,
+           classifier: ColourClassifier | None = None) -> tuple[list[str] | None, int]:
+    """
+    Read row frames (images of one row's strip) until the row settles.
+    Returns its colours and the number of frames read, or None and the
+    number of frames if the sequence ran out first.
+    """
+
+    detector = StabilityDetector(stable_frames, tolerance, classifier)
+    seen = 0
+    for frame in frames:
+        seen += 1
+        if detector.feed(tile_means(frame)[0]):
+            return detector.colours, seen
+    return None, seen
+
+def poll_row(grab: Callable[[], np.ndarray], timeout: float = POLL_TIMEOUT, interval: float = POLL_INTERVAL,
+             stable_frames: int = STABLE_FRAMES, tolerance: int = TOLERANCE, classifier: ColourClassifier | None = None) -> RowReading:
+    """
+    Call grab (returning the current row's strip) every interval seconds until
+    the row settles or timeout seconds pass.
+    """
+
+    started = time.perf_counter()
+    # Seconds spent in grab() and asleep; the rest of the wait is classification
+    grabbing, sleeping = 0.0, 0.0
+
+    def frames():
+        nonlocal grabbing, sleeping
+        while True:
+            before = time.perf_counter()
+            frame = grab()
+            grabbing += time.perf_counter() - before
+            yield frame
+            if time.perf_counter() - started >= timeout:
+                return
+            before = time.perf_counter()
+            time.sleep(interval)
+            sleeping += time.perf_counter() - before
+
+    colours, seen = settle(frames(), stable_frames, tolerance, classifier)
+    latency = time.perf_counter() - started
+    return RowReading(colours, seen, latency, grabbing, max(0.0, latency - grabbing - sleeping))
+
+def load_image(path: str) -> np.ndarray:
+    """A saved screenshot or frame as an RGB array."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+def load_frames(paths: Iterable[str]) -> Iterable[np.ndarray]:
+    """Recorded frames (PNG files, in order) as arrays, for replaying settle() offline."""
+    for path in paths:
+        yield load_image(path)
+
+
+####################################################################################################
+# FIXTURES
+# A fixture directory holds saved board screenshots and a labels.json mapping
+# each file name to its rows of tile colours (null for unrevealed tiles).
+# The boards shipped in fixtures/boards are synthetic renders in the game's
+# dark palette, not captures; real screenshots belong next to them.
+
+def evaluate_boards(boards: Iterable[tuple[str, np.ndarray, list[list]]], classifier: ColourClassifier | None = None) -> dict:
+    """
+    Classify every (name, image, rows of expected colours) board; returns tile
+    accuracy, misread tiles and ms per board.
+    """
+
+    classifier = classifier or ColourClassifier()
+    count, correct, total, seconds, misread = 0, 0, 0, 0.0, []
+    for name, image, rows in boards:
+        count += 1
+        started = time.perf_counter()
+        colours = BoardReader(classifier).read(image, len(rows))
+        seconds += time.perf_counter() - started
+
+        for row, (expected, found) in enumerate(zip(rows, colours)):
+            for col, (want, got) in enumerate(zip(expected, found)):
+                total += 1
+                if want == got:
+                    correct += 1
+                else:
+                    misread.append(f"{name} row {row} col {col}: {got} (expected {want})")
+
+    return {
+        "boards": count, "tiles": total, "accuracy": correct / max(total, 1),
+        "ms_per_board": seconds * 1000 / max(count, 1), "misread": misread,
+    }
+
+def evaluate_fixtures(directory: str, classifier: ColourClassifier | None = None) -> dict:
+    """evaluate_boards() over the labelled screenshots of a fixture directory."""
+
+    with open(os.path.join(directory, "labels.json")) as file:
+        labels = json.load(file)
+
+    boards = ((name, load_image(os.path.join(directory, name)), rows) for name, rows in sorted(labels.items()))
+    return evaluate_boards(boards, classifier)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check the board reader offline against recorded screenshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay = commands.add_parser("settle", help="Replay recorded row frames through the stability detector")
+    replay.add_argument("frames", nargs="+", help="PNG frames of one row's strip, in order")
+    replay.add_argument("--stable-frames", type=int, default=STABLE_FRAMES, help="Consecutive identical frames needed")
+    replay.add_argument("--tolerance", type=int, default=TOLERANCE, help="Largest per-channel change counted as identical")
+
+    check = commands.add_parser("colours", help="Measure tile colour accuracy and speed on labelled screenshots")
+    check.add_argument("directory", nargs="?", default=FIXTURES, help="Fixture directory with a labels.json")
+
+    args = parser.parse_args()
+
+    if args.command == "settle":
+        colours, seen = settle(load_frames(args.frames), args.stable_frames, args.tolerance)
+        if colours is None:
+            print(f"Row never settled over {seen} frames")
+        else:
+            print(f"Settled after {seen}/{len(args.frames)} frames: {colours}")
+    else:
+        result = evaluate_fixtures(args.directory)
+        for line in result["misread"]:
+            print(line)
+        print(f"{result['boards']} boards, {result['tiles']} tiles: {result['accuracy']:.1%} correct, {result['ms_per_board']:.3f} ms per board")
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+from patterns import word_list_hash
+
+# Bumped whenever the file layout or the key changes
+CACHE_VERSION = 1
+
+# Entries kept in memory by default; the least recently used is dropped beyond this
+MAX_ENTRIES = 100_000
+
+
+class TranspositionCache:
+    """
+    next_guess results keyed by the set of answers left, so a state reached
+    again (in another game, session or run) is a lookup instead of a sweep.
+    Entries are kept in an LRU of max_entries; with a path they are loaded
+    from it on first use and written back by save(). A file saved for another
+    word list or strategy is ignored, and replaced on the next save.
+    """
+
+    def __init__(self, words: list[str], path: str | None = None, max_entries: int = MAX_ENTRIES, strategy: tuple = ()):
+        """
+        :param words: The solver's word list (answers are keyed by their indices into it)
+        :param path: Optional .npz file the entries persist to
+        :param strategy: Parameters next_guess's result depends on besides the answers
+            (for example the threshold below which only answers are guessed)
+        """
+
+        self.words = words
+        self.path = path
+        self.max_entries = max_entries
+        self.strategy = repr(strategy)
+        self.hits = 0
+        self.misses = 0
+        self._entries = None
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> "OrderedDict[bytes, tuple[str, float]]":
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    @staticmethod
+    def key(answer_ids: np.ndarray) -> bytes:
+        """Fingerprint of a set of answers: the digest of their sorted indices."""
+        return hashlib.sha1(np.sort(answer_ids).astype("<i4").tobytes()).digest()
+
+    def get(self, answer_ids: np.ndarray) -> tuple[str, float] | None:
+        key = self.key(answer_ids)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+    def put(self, answer_ids: np.ndarray, guess: str, entropy: float) -> None:
+        key = self.key(answer_ids)
+        with self._lock:
+            self.entries[key] = (guess, entropy)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _load(self) -> "OrderedDict[bytes, tuple[str, float]]":
+        entries = OrderedDict()
+        if self.path is None or not os.path.exists(self.path):
+            return entries
+
+        with np.load(self.path) as data:
+            if (int(data["version"]) != CACHE_VERSION
+                    or str(data["word_hash"]) != word_list_hash(self.words)
+                    or str(data["strategy"]) != self.strategy):
+                return entries
+
+            # Stored oldest first, so the most recently used entries survive a smaller max_entries
+            keys, guesses, entropies = data["keys"], data["guesses"], data["entropies"]
+            for key, guess, ent in zip(keys[-self.max_entries:], guesses[-self.max_entries:], entropies[-self.max_entries:]):
+                entries[bytes(key)] = (guess.decode("ascii"), float(ent))
+
+        return entries
+
+    def save(self, path: str | None = None) -> None:
+        """Write the entries (oldest first) to path, or to the cache's own path."""
+
+        path = path or self.path
+        if path is None or self._entries is None:
+            return
+
+        with self._lock:
+            keys = list(self._entries)
+            values = [self._entries[key] for key in keys]
+
+        # Write to a temporary file first so a half-written cache is never loaded
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            keys=np.array(keys, dtype="S20"),
+            guesses=np.array([guess.encode("ascii") for guess, _ in values], dtype="S"),
+            entropies=np.array([ent for _, ent in values], dtype=np.float64),
+            version=CACHE_VERSION, word_hash=word_list_hash(self.words), strategy=self.strategy,
+        )
+        os.replace(tmp_path, path)
@@ -1,91 +1,117 @@
 # IMPORTS AND ARGPARSE
 
 import argparse
+import atexit
 from collections import Counter
-import math
 import sys
 import time
 
-from utils import load_words
-
-parser = argparse.ArgumentParser(description="Entropy-based Word Guessing Bot")
-parser.add_argument("-w", "--wordlist", type=str, required=True, help="Path to the word list file")
-args = parser.parse_args()
-
-
-WORDS = load_words(args.wordlist)
+import numpy as np
+
+from cache import TranspositionCache
+import instrument
+from parallel import ParallelScorer
+from patterns import N_PATTERNS, compute_patterns, encode_words, load_pattern_matrix
+from utils import load_words, str_to_pattern
+from wordindex import WordIndex
+from wordlist import CompiledWordList, is_compiled
+from wordtable import WordTable
+
+
+def make_parser(description: str = "Entropy-based Word Guessing Bot") -> argparse.ArgumentParser:
+    """Build the argument parser shared by every entry point; callers add their own options."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("-w", "--wordlist", type=str, required=True, help="Path to the word list file")
+    parser.add_argument("--cache", type=str, default=None, help="Transposition cache file: loaded on start, saved on exit")
+    parser.add_argument("--incremental", action="store_true", help="Update pattern histograms between turns instead of recounting them")
+    parser.add_argument("--trace", type=str, default=None, help="Write a JSON line per turn and per game with hot-path counts and timings")
+    parser.add_argument("--profile-turn", type=int, default=None, help="Run this turn of a game under cProfile (see --trace)")
+    parser.add_argument("--prune", action="store_true", help="Skip candidate guesses whose entropy bound cannot beat the best so far")
+    parser.add_argument("--parallel", type=int, default=None, metavar="WORKERS", help="Score each turn's candidates across this many processes")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Candidates per chunk sent to a --parallel worker")
+    return parser
 
 ####################################################################################################
 # FEEDBACK 
 
-def feedback(guess, answer):
+def feedback_code(guess, answer) -> int:
     """
-        Provides feedback on a guess compared to the answer.
-        Returns a tuple (code, greens, yellows):
-        - code: integer encoding of the pattern in base-3 (MSB at pos 0), where
-            2=green, 1=yellow, 0=gray
-        - greens: list of (letter, index) for letters that are green
-        - yellows: list of (letter, index) for letters that are yellow
-        - greys: list of (letter, index) for letters that are gray
+        Computes only the feedback code of a guess compared to the answer:
+        an integer encoding of the pattern in base-3 (MSB at pos 0), where
+        2=green, 1=yellow, 0=gray.
+        Letter counts are kept in a fixed 26-slot array instead of a Counter.
     """
 
     assert len(guess) == len(answer), "guess and answer must be same length"
     n = len(guess)
+    # Letters index the count array below, so anything but a-z would land in another slot
+    letters = guess + answer
+    if not (letters.isascii() and letters.isalpha() and letters.islower()):
+        raise ValueError(f"{guess!r} and {answer!r} must be words of letters a-z")
+
+    if instrument.enabled:
+        instrument.count("feedback")
 
-    # First pass: mark greens and count non-green letters in answer
-    green = [False] * n
-    answer_counts = Counter()
+    # First pass: count non-green letters in answer
+    answer_counts = [0] * 26
     for i in range(n):
-        g = guess[i]
-        a = answer[i]
-        if g == a:
-            green[i] = True
-        else:
-            answer_counts[a] += 1
+        if guess[i] != answer[i]:
+            answer_counts[ord(answer[i]) - 97] += 1
 
     # Second pass: compute code in base-3 (most-significant at pos 0)
     code = 0
     for i in range(n):
         code *= 3
-        if green[i]:
-            val = 2
+        g = guess[i]
+        if g == answer[i]:
+            code += 2
         else:
-            g = guess[i]
-            if answer_counts.get(g, 0) > 0:
-                val = 1
-                answer_counts[g] -= 1
-            else:
-                val = 0
-        code += val
+            k = ord(g) - 97
+            if answer_counts[k] > 0:
+                answer_counts[k] -= 1
+                code += 1
+
+    return code
+
+def feedback_codes(guess, answers) -> np.ndarray:
+    """
+        Computes the feedback codes of one guess against many answers in bulk.
+        Returns a uint8 array (Solver.feedback_codes reads them from the pattern matrix instead).
+    """
 
-    # Build lists of (letter, index)
+    return compute_patterns(encode_words([guess]), encode_words(answers))[0]
+
+def decode_feedback(guess, code):
+    """
+        Decodes a feedback code for a guess into the lists used by update_colours:
+        - greens: list of (letter, index) for letters that are green
+        - yellows: list of (letter, index) for letters that are yellow
+        - greys: list of (letter, index) for letters that are gray
+    """
+
+    n = len(guess)
     greens = []
     yellows = []
     greys = []
-    # Recompute pass to collect positions (we already determined green[] and
-    # decreased answer_counts while computing code above, so recompute in the
-    # same loop to avoid extra passes)
-    # To do this efficiently, walk positions again and determine val as above.
-    # We need a fresh copy of answer_counts (counts of non-green letters in
-    # answer) to correctly identify yellow positions.
-    answer_counts = Counter()
     for i in range(n):
-        if not green[i]:
-            answer_counts[answer[i]] += 1
-
-    for i in range(n):
-        if green[i]:
+        val = code // 3 ** (n - 1 - i) % 3
+        if val == 2:
             greens.append((guess[i], i))
+        elif val == 1:
+            yellows.append((guess[i], i))
         else:
-            g = guess[i]
-            if answer_counts.get(g, 0) > 0:
-                yellows.append((g, i))
-                answer_counts[g] -= 1
+            greys.append((guess[i], i))
 
-            else:
-                greys.append((g, i))
+    return greens, yellows, greys
+
+def feedback(guess, answer):
+    """
+        Provides feedback on a guess compared to the answer.
+        Returns a tuple (code, greens, yellows, greys), see feedback_code and decode_feedback.
+    """
 
-    return code, greens, yellows, greys
+    code = feedback_code(guess, answer)
+    return (code, *decode_feedback(guess, code))
 
 def is_guess_valid(guess, green, yellow, gray, min_required=None):
     """
@@ -149,14 +175,21 @@ def is_guess_valid(guess, green, yellow, gray, min_required=None):
 
     return True
 
-def filter_words(possible_words, green, yellow, gray, min_required=None):
+def filter_words(possible_words, green, yellow, gray, min_required=None, index: WordIndex | None = None):
     """
     Filter the list of possible words based on the feedback constraints.
     - green: dict of position -> letter (correct letters in correct positions)
     - yellow: dict of letter -> set of positions (correct letters in wrong positions)
     - gray: set of letters (incorrect letters)
+    - index: optional WordIndex; words it covers are filtered through its
+      bitmasks, any other list falls back to checking each word with is_guess_valid
     """
 
+    if index is not None:
+        filtered = index.filter(possible_words, green, yellow, gray, min_required=min_required)
+        if filtered is not None:
+            return filtered
+
     filtered = []
     for word in possible_words:
         if is_guess_valid(word, green, yellow, gray, min_required=min_required):
@@ -164,7 +197,11 @@ def filter_words(possible_words, green, yellow, gray, min_required=None):
     return filtered
 
 
-def get_feedback_from_user() -> tuple[list[tuple[str, int]], list[tuple[str, int]], list[tuple[str, int]]]:
+def get_feedback_from_user(history: list | None = None) -> tuple[list[tuple[str, int]], list[tuple[str, int]], list[tuple[str, int]]]:
+    """
+    Ask the user for the words they tried and the feedback for each.
+    If history is given, a (word, code) pair is appended to it for every word entered.
+    """
 
     greens = []
     yellows = []
@@ -173,19 +210,23 @@ def get_feedback_from_user() -> tuple[list[tuple[str, int]], list[tuple[str, int
     while True:
 
         while True:
-            user_guess = input("Enter a word you tried (5-letter word, DONE to finish): ")
+            user_guess = input("Enter a word you tried (5-letter word, DONE to finish): ").strip()
             if user_guess.upper() == "DONE":
                 return greens, yellows, greys
-            
-            if len(user_guess) != 5:
+
+            # The constraints (and the word index) are in lowercase a-z
+            user_guess = user_guess.lower()
+            if len(user_guess) != 5 or not user_guess.isascii() or not user_guess.isalpha():
                 print("Invalid guess. Please enter a 5-letter word.")
                 continue
 
             break
 
         while True:
-            user_input = input("Enter feedback (g for green, y for yellow, x for gray, e.g. 'ggyxx'): ")
-            if len(user_input) != 5 or any(c not in 'gyx' for c in user_input):
+            user_input = input("Enter feedback (g for green, y for yellow, x for gray, e.g. 'ggyxx'): ").strip().lower()
+            try:
+                code = str_to_pattern(user_input, 5)
+            except ValueError:
                 print("Invalid input. Please enter a 5-character string using 'g', 'y', and 'x'.")
                 continue
 
@@ -196,6 +237,9 @@ def get_feedback_from_user() -> tuple[list[tuple[str, int]], list[tuple[str, int
                     yellows.append((user_guess[i], i))
                 elif c == 'x':
                     greys.append((user_guess[i], i))
+
+            if history is not None:
+                history.append((user_guess, code))
             
             break
 
@@ -203,26 +247,49 @@ def get_feedback_from_user() -> tuple[list[tuple[str, int]], list[tuple[str, int
 ####################################################################################################
 # ENTROPY CALCULATION
 
-def entropy(guess, possible_answers=WORDS):
+# Upper bound on codes gathered at once by the batched kernel (keeps memory bounded)
+BATCH_CELLS = 1 << 22
+
+def pattern_counts(codes: np.ndarray) -> np.ndarray:
+    """
+    Histogram every row of a 2D array of feedback codes in one pass.
+    Each row gets its own block of N_PATTERNS buckets in a single bincount.
+    """
+
+    rows = codes.shape[0]
+    offsets = codes + (np.arange(rows, dtype=np.intp) * N_PATTERNS)[:, None]
+    return np.bincount(offsets.ravel(), minlength=rows * N_PATTERNS).reshape(rows, N_PATTERNS)
+
+def entropies_from_counts(counts: np.ndarray) -> np.ndarray:
+    """
+    Calculate the entropy of every row of a (rows, N_PATTERNS) array of pattern counts.
+    Counts are summed in sorted order so guesses with the same partition
+    sizes always get bit-identical entropies.
+    """
+
+    counts = np.sort(counts, axis=1)
+    totals = np.maximum(counts.sum(axis=1, keepdims=True), 1)
+
+    p = counts / totals
+    logs = np.log2(p, out=np.zeros_like(p), where=counts > 0)
+    return -(p * logs).sum(axis=1)
+
+def entropies_from_codes(codes: np.ndarray) -> np.ndarray:
+    """Calculate the entropy of every row of a 2D array of feedback codes in one pass."""
+    return entropies_from_counts(pattern_counts(codes))
+
+def entropy_from_codes(codes) -> float:
+    """Calculate the entropy of a sequence of feedback codes."""
+    return float(entropies_from_codes(np.asarray(codes, dtype=np.intp)[None, :])[0])
+
+def entropy(guess, possible_answers):
     """
     Calculate the entropy of a guess over the current word list.
     Entropy is calculated based on the distribution of feedback patterns
     that would result from this guess against all possible answers.
     """
 
-    # Use a plain dict for counts (a bit faster than Counter here)
-    pattern_counts = {}
-    for answer in possible_answers:
-        pattern, _, _, _ = feedback(guess, answer)
-        pattern_counts[pattern] = pattern_counts.get(pattern, 0) + 1
-
-    total_answers = len(possible_answers)
-    ent = 0.0
-    for count in pattern_counts.values():
-        p = count / total_answers
-        ent -= p * math.log2(p)
-
-    return ent
+    return entropy_from_codes(feedback_codes(guess, possible_answers))
 
 
 ####################################################################################################
@@ -237,71 +304,472 @@ POSSIBLE_ANSWERS_THRESHOLD = 3
 # Opening guess - pre-computed to save time on first turn
 OPENING_GUESS = "raise"
 
-def next_guess(possible_words=WORDS, green: dict | None = None, yellow: dict | None = None, gray: set | None = None, min_required: dict | None = None, show_progress=False) -> tuple[str, float, list[str]]:
+# Candidates scored first by an ordered search, before it widens to BATCH_CELLS blocks
+SHORTLIST_SIZE = 64
+
+# Slack between an entropy bound and a computed entropy, covering float rounding
+PRUNE_EPSILON = 1e-9
+
+class SearchStats:
+    """What the last Solver.next_guess call did, for callers that want to report it."""
+
+    def __init__(self, candidates: int = 0):
+        self.candidates = candidates  # candidate guesses considered
+        self.evaluated = 0            # candidates whose exact entropy was computed
+        self.pruned = 0               # candidates skipped because their entropy bound could not win
+        self.duplicates = 0           # candidates folded into an equivalent earlier guess
+        self.completed = True         # False if a time budget cut the search short
+
+
+class PatternHistograms:
+    """
+    The 243-bucket feedback pattern histogram of every word of a solver's list,
+    as a guess, over one game's remaining answers. The answers only shrink
+    during a game, so each turn the histograms are brought up to date by
+    subtracting the eliminated answers, or rebuilt from the survivors when
+    fewer survive than were eliminated.
     """
-    Computes the next guess based on the word list and current feedback.
 
-    The function takes the following parameters:
-    - possible_words: the list of words to consider for the next guess
-    - green: a dictionary mapping letter positions to letters that are definitely in the correct position
-    - yellow: a dictionary mapping letter positions to letters that are probably in the correct position
-    - gray: a set of letters that are definitely not in the correct position
-    - min_required: a dictionary mapping letters to their minimum required occurrences
+    def __init__(self, solver: "Solver"):
+        self.solver = solver
+        self.answer_ids = None  # answers counted so far (None: not built yet)
+        self.counts = None      # (words, N_PATTERNS) int32
+
+    def _histograms(self, answer_ids: np.ndarray) -> np.ndarray:
+        """Histograms of every guess over answer_ids, read from the pattern matrix in row blocks."""
+
+        patterns = self.solver.patterns
+        counts = np.empty((patterns.shape[0], N_PATTERNS), dtype=np.int32)
+        step = max(1, BATCH_CELLS // max(len(answer_ids), 1))
+        for start in range(0, patterns.shape[0], step):
+            codes = patterns[start:start + step][:, answer_ids]
+            counts[start:start + step] = pattern_counts(codes.astype(np.intp))
+        return counts
+
+    def update(self, answer_ids: np.ndarray) -> None:
+        """Bring the histograms to the answers answer_ids."""
+
+        if self.counts is not None and np.array_equal(self.answer_ids, answer_ids):
+            return
+
+        if self.counts is not None:
+            kept = np.isin(self.answer_ids, answer_ids)
+            removed = self.answer_ids[~kept]
+            # Subtracting only works when answer_ids is what survives of the counted answers
+            if np.count_nonzero(kept) == len(answer_ids) and len(removed) < len(answer_ids):
+                self.counts -= self._histograms(removed)
+                self.answer_ids = answer_ids
+                return
+
+        self.counts = self._histograms(answer_ids)
+        self.answer_ids = answer_ids
 
-    The function returns a tuple containing the next guess, its entropy, and the filtered word list.
+    def entropies(self, guess_ids: np.ndarray, answer_ids: np.ndarray) -> np.ndarray:
+        """Entropy of every guess over the answers, as Solver.entropies_ids computes it, after updating the histograms."""
+        self.update(answer_ids)
+        return entropies_from_counts(self.counts[guess_ids])
+
+
+class Solver:
+    """
+    Owns a word list and the structures precomputed from it (word table,
+    pattern matrix, constraint index). Everything is built lazily on first use,
+    so creating a Solver is cheap and several word lists can be loaded in one
+    process. Subsets of the list are passed around as index arrays into it.
     """
 
-    if green is None:
-        green = {}
-    if yellow is None:
-        yellow = {}
-    if gray is None:
-        gray = set()
-
-    filtered_words = filter_words(possible_words, green, yellow, gray, min_required=min_required)
-
-    total = len(WORDS)
-    max_entropy = -1.0
-    best_guess = None
-
-    if len(filtered_words) == 1:
-        print("\nAnswer found!")
-        return filtered_words[0], max_entropy, filtered_words
-    if len(filtered_words) == 0:
-        print("No valid words remaining with the given constraints.")
-        print("GREEN", green)
-        print("YELLOW", yellow)
-        print("GRAY", gray)
-        exit(1)
-
-    # Use pre-computed opening guess when starting from full word list
-    if len(filtered_words) == len(WORDS):
-        return OPENING_GUESS, entropy(OPENING_GUESS, WORDS), filtered_words
-
-    start = time.time()
+    def __init__(self, wordlist: str | None = None, words: list[str] | None = None):
+        """
+        :param wordlist: Path to the word list file, text or compiled (also where the pattern matrix is cached)
+        :param words: The word list itself, if already loaded
+        """
+
+        if wordlist is None and words is None:
+            raise ValueError("Solver needs a wordlist path or a list of words")
+
+        self.wordlist = wordlist
+        self._words = words
+        self._compiled = None
+        self._table = None
+        self._patterns = None
+        self._index = None
+
+        # Optional precomputed strategy tree (see policy.py), consulted by GameState.next_guess
+        self.policy = None
+
+        # Optional opening book (see opening.py), consulted by next_guess on turn two
+        self.opening_book = None
+
+        # Optional transposition cache (see cache.py), consulted by next_guess before searching
+        self.cache = None
+
+        # Optional process pool (see parallel.py) for the full pass over a heavy turn's candidates
+        self.parallel = None
+
+        # Statistics of the most recent next_guess search
+        self.last_search = SearchStats()
+
+        # Exact search: skip candidates whose entropy bound cannot beat the best so far
+        self.prune = False
+
+        # Games keep per-guess pattern histograms between turns (see PatternHistograms)
+        self.incremental = False
+
+        # Score one guess per class of guesses that partition the answers identically
+        self.dedupe = True
+
+        # Print next_guess status lines ("Eliminating", "Answer found!", ...)
+        self.verbose = True
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "Solver":
+        """Build a solver from parsed make_parser() arguments."""
+        solver = cls(args.wordlist)
+        solver.prune = args.prune
+        solver.incremental = args.incremental
+        if args.cache is not None:
+            solver.cache = solver.make_cache(args.cache)
+            atexit.register(solver.cache.save)
+        if args.parallel is not None and args.parallel > 1:
+            solver.parallel = ParallelScorer(solver, args.parallel, args.chunk_size)
+            atexit.register(solver.parallel.close)
+        if args.trace is not None or args.profile_turn is not None:
+            instrument.enable(open(args.trace, "w") if args.trace else None, profile_turn=args.profile_turn)
+        return solver
+
+    @property
+    def compiled(self) -> CompiledWordList | None:
+        """The memory-mapped word list file, if the solver was given a compiled one."""
+        if self._compiled is None and self._words is None and self.wordlist is not None and is_compiled(self.wordlist):
+            self._compiled = CompiledWordList(self.wordlist)
+        return self._compiled
+
+    @property
+    def table(self) -> WordTable:
+        """The word list as arrays, built on first use (mapped straight from a compiled list)."""
+        if self._table is None:
+            compiled = self.compiled
+            if compiled is not None and compiled.counts is not None:
+                self._table = WordTable(compiled.words, compiled.letters, compiled.counts, compiled.presence)
+            else:
+                self._table = WordTable(self._words if self._words is not None else load_words(self.wordlist))
+        return self._table
+
+    @property
+    def words(self) -> list[str]:
+        return self.table.words
+
+    @property
+    def word_ids(self) -> dict[str, int]:
+        return self.table.ids
+
+    @property
+    def patterns(self) -> np.ndarray:
+        """Guess x answer feedback codes for the word list, built (or memory-mapped) on first use."""
+        if self._patterns is None:
+            compiled = self.compiled
+            if compiled is not None and compiled.patterns is not None:
+                self._patterns = compiled.patterns
+            else:
+                self._patterns = load_pattern_matrix(self.words, self.wordlist)
+        return self._patterns
+
+    @property
+    def index(self) -> WordIndex:
+        """Constraint bitmask index over the word list, built on first use."""
+        if self._index is None:
+            self._index = WordIndex(self.table)
+        return self._index
+
+    def ids(self, words) -> np.ndarray | None:
+        """Map words to their indices in the word list, or None if any word is not in the list."""
+        return self.table.index_of(words)
+
+    def make_cache(self, path: str | None = None, **kwargs) -> TranspositionCache:
+        """A transposition cache for this word list and strategy, persisted at path if given."""
+        return TranspositionCache(self.words, path, strategy=(POSSIBLE_ANSWERS_THRESHOLD, OPENING_GUESS), **kwargs)
+
+    def new_game(self) -> "GameState":
+        """Start a fresh game over the whole word list."""
+        return GameState(self)
+
+    def feedback_codes(self, guess, answers) -> np.ndarray:
+        """Feedback codes of one guess against many answers, read from the pattern matrix when possible."""
+
+        guess_id = self.word_ids.get(guess)
+        answer_ids = self.ids(answers)
+        if guess_id is not None and answer_ids is not None:
+            return np.asarray(self.patterns[guess_id, answer_ids])
+
+        return feedback_codes(guess, answers)
+
+    def filter_words(self, possible_words, green, yellow, gray, min_required=None) -> list[str]:
+        """filter_words() through this solver's constraint index."""
+        if not instrument.enabled:
+            return filter_words(possible_words, green, yellow, gray, min_required=min_required, index=self.index)
+
+        started = time.perf_counter()
+        filtered = filter_words(possible_words, green, yellow, gray, min_required=min_required, index=self.index)
+        instrument.filter_pass(len(possible_words), len(filtered), time.perf_counter() - started)
+        return filtered
+
+    def filter_ids(self, ids: np.ndarray, green, yellow, gray, min_required=None) -> np.ndarray:
+        """Narrow an index array into the word list to the words satisfying the constraints."""
+        if not instrument.enabled:
+            return self.index.filter_ids(ids, green, yellow, gray, min_required=min_required)
+
+        started = time.perf_counter()
+        filtered = self.index.filter_ids(ids, green, yellow, gray, min_required=min_required)
+        instrument.filter_pass(len(ids), len(filtered), time.perf_counter() - started)
+        return filtered
+
+    def entropy(self, guess, possible_answers=None) -> float:
+        """Entropy of a guess over possible_answers (the whole word list by default)."""
+        if possible_answers is None:
+            possible_answers = self.words
+        return entropy_from_codes(self.feedback_codes(guess, possible_answers))
+
+    def entropies(self, guesses: list[str], possible_answers: list[str], progress=None) -> np.ndarray:
+        """
+        Calculate the entropy of every guess over the same answer list.
+        Codes are read from the pattern matrix (or computed in bulk for words
+        outside the list) in row blocks of at most BATCH_CELLS codes.
+        progress, if given, is called with the number of guesses done after each block.
+        """
+
+        guess_ids = self.ids(guesses)
+        answer_ids = self.ids(possible_answers)
+        if guess_ids is not None and answer_ids is not None:
+            return self.entropies_ids(guess_ids, answer_ids, progress=progress)
+
+        answer_letters = encode_words(possible_answers)
+        result = np.empty(len(guesses), dtype=np.float64)
+        step = max(1, BATCH_CELLS // max(len(possible_answers), 1))
+        for start in range(0, len(guesses), step):
+            stop = min(start + step, len(guesses))
+            codes = compute_patterns(encode_words(guesses[start:stop]), answer_letters)
+            result[start:stop] = entropies_from_codes(codes.astype(np.intp))
+            if progress is not None:
+                progress(stop)
+
+        return result
+
+    def entropies_ids(self, guess_ids: np.ndarray, answer_ids: np.ndarray, progress=None) -> np.ndarray:
+        """entropies() for index arrays into the word list, read from the pattern matrix."""
+
+        result = np.empty(len(guess_ids), dtype=np.float64)
+        step = max(1, BATCH_CELLS // max(len(answer_ids), 1))
+        for start in range(0, len(guess_ids), step):
+            stop = min(start + step, len(guess_ids))
+            codes = self.patterns[np.ix_(guess_ids[start:stop], answer_ids)]
+            result[start:stop] = entropies_from_codes(codes.astype(np.intp))
+            if progress is not None:
+                progress(stop)
+
+        return result
+
+    def distinct_candidates(self, candidate_ids: np.ndarray, answer_ids: np.ndarray) -> np.ndarray:
+        """
+        Drop every candidate that splits the answers exactly like an earlier one.
+        Letters absent from all answers always come back gray, so two guesses
+        that differ only in such letters produce the same feedback for every
+        answer; the first guess of each such class is kept, in order.
+        """
+
+        present = self.table.letters_present(answer_ids)
+        absent = (present >> np.arange(26)) & 1 == 0
+        signature = self.table.letters[candidate_ids].astype(np.int64)
+        signature[absent[signature]] = 26
+
+        keys = signature @ (27 ** np.arange(signature.shape[1], dtype=np.int64))
+        _, first = np.unique(keys, return_index=True)
+        if len(first) == len(candidate_ids):
+            return candidate_ids
+        return candidate_ids[np.sort(first)]
+
+    def _search(self, candidate_ids: np.ndarray, answer_ids: np.ndarray, stats: SearchStats, deadline: float | None = None, progress=None) -> tuple[int, float]:
+        """
+        Score candidates in blocks, a small shortlist first, and return the
+        position in candidate_ids of the best guess and its entropy. What the
+        search did is recorded in stats.
+
+        With a deadline, candidates are ordered by letter-frequency coverage of
+        the answers, each block after the shortlist is sized to the time left
+        and the search stops once the deadline passes. With self.prune, they
+        are ordered by an upper bound on their entropy instead (see
+        WordIndex.pattern_bounds) and skipped once the bound cannot beat the
+        best found so far. Once the search completes the result is the
+        same guess as a full pass, including the first-wins tie rule.
+        """
+
+        bounds = None
+        if self.prune:
+            # No guess can beat log2 of the number of patterns it can produce
+            ceiling = np.log2(min(N_PATTERNS, len(answer_ids)))
+            patterns = np.minimum(self.index.pattern_bounds(answer_ids)[candidate_ids], len(answer_ids))
+            bounds = np.log2(patterns)
+            order = np.argsort(-bounds, kind="stable")
+        else:
+            # Fraction of answers containing each letter, summed over each candidate's distinct letters
+            presence = self.index.count_ge[:, 1, :]
+            letter_freq = presence[:, answer_ids].mean(axis=1)
+            coverage = letter_freq @ presence[:, candidate_ids]
+            order = np.argsort(-coverage, kind="stable")
+
+        best, max_entropy = -1, -1.0
+        pending = order
+        step = SHORTLIST_SIZE
+        full_step = max(SHORTLIST_SIZE, BATCH_CELLS // max(len(answer_ids), 1))
+        while len(pending):
+            block, pending = pending[:step], pending[step:]
+            block_started = time.time()
+            scores = entropies_from_codes(self.patterns[np.ix_(candidate_ids[block], answer_ids)].astype(np.intp))
+            stats.evaluated += len(block)
+
+            # Keep the first (lowest-index) candidate among equal maxima, as a full pass would
+            top = scores.max()
+            idx = int(block[scores == top].min())
+            if top > max_entropy or (top == max_entropy and idx < best):
+                best, max_entropy = idx, float(top)
+
+            if bounds is not None:
+                keep = bounds[pending] + PRUNE_EPSILON >= max_entropy
+                # Every guess reaching the ceiling has the same pattern counts, so only earlier ones can still win
+                if max_entropy >= ceiling - PRUNE_EPSILON:
+                    keep &= pending < best
+                stats.pruned += len(pending) - int(np.count_nonzero(keep))
+                pending = pending[keep]
+
+            if progress is not None:
+                progress(len(candidate_ids) - len(pending))
+            if deadline is None:
+                step = full_step
+                continue
+
+            now = time.time()
+            if now >= deadline:
+                break
+            # Size the next block to the time left at the rate this one was scored,
+            # so the last block ends near the deadline instead of a whole batch past it
+            rate = len(block) / max(now - block_started, 1e-6)
+            step = int(min(full_step, max(SHORTLIST_SIZE, rate * (deadline - now))))
+
+        stats.completed = len(pending) == 0
+        return best, max_entropy
+
+    def next_guess(self, possible_words=None, green: dict | None = None, yellow: dict | None = None, gray: set | None = None, min_required: dict | None = None, show_progress=False, time_budget: float | None = None, histograms: "PatternHistograms | None" = None) -> tuple[str, float, list[str]]:
+        """
+        Computes the next guess based on the word list and current feedback.
+
+        The function takes the following parameters:
+        - possible_words: the list of words to consider for the next guess (the whole word list by default)
+        - green: a dictionary mapping letter positions to letters that are definitely in the correct position
+        - yellow: a dictionary mapping letter positions to letters that are probably in the correct position
+        - gray: a set of letters that are definitely not in the correct position
+        - min_required: a dictionary mapping letters to their minimum required occurrences
+        - time_budget: if given, seconds after which to stop refining and return the best guess
+          found so far (last_search.completed tells whether every candidate was scored)
+        - histograms: per-guess pattern histograms carried over from the previous turn
+          of the same game (see PatternHistograms), used by the full batched pass
+
+        With self.prune set, candidates whose entropy bound cannot beat the best guess
+        so far are skipped (last_search.pruned counts them); the guess is unchanged.
+        With self.cache set, a set of remaining answers seen before is a lookup.
+        With self.parallel set, the full pass over a heavy turn's candidates is split
+        across its process pool (searches with a time budget or pruning stay serial).
+
+        The function returns a tuple containing the next guess, its entropy, and the filtered word list.
+        """
+
+        possible_ids = self.table.all_ids if possible_words is None else self.ids(possible_words)
+        if possible_ids is None:
+            raise ValueError("possible_words must be words from the solver's word list")
+
+        guess, ent, filtered_ids = self.next_guess_ids(
+            possible_ids, green, yellow, gray, min_required=min_required,
+            show_progress=show_progress, time_budget=time_budget, histograms=histograms
+        )
+        return guess, ent, self.table.subset(filtered_ids)
+
+    def next_guess_ids(self, possible_ids: np.ndarray, green: dict | None = None, yellow: dict | None = None, gray: set | None = None, min_required: dict | None = None, show_progress=False, time_budget: float | None = None, histograms: "PatternHistograms | None" = None) -> tuple[str, float, np.ndarray]:
+        """
+        next_guess() for an index array into the word list; returns the
+        next guess, its entropy, and the filtered index array.
+        """
+
+        called = time.time()
+        # Solvers may be shared across threads (see server.py): this call's statistics
+        # stay local and are only published to last_search when it returns
+        stats = SearchStats()
+
+        if green is None:
+            green = {}
+        if yellow is None:
+            yellow = {}
+        if gray is None:
+            gray = set()
+
+        filtered_ids = self.filter_ids(possible_ids, green, yellow, gray, min_required=min_required)
+
+        total = len(self.words)
+        max_entropy = -1.0
+        best_guess = None
+
+        if len(filtered_ids) == 1:
+            if self.verbose:
+                print("\nAnswer found!")
+            self.last_search = stats
+            return self.words[filtered_ids[0]], max_entropy, filtered_ids
+        if len(filtered_ids) == 0:
+            print("No valid words remaining with the given constraints.")
+            print("GREEN", green)
+            print("YELLOW", yellow)
+            print("GRAY", gray)
+            exit(1)
+
+        # Use pre-computed opening guess when starting from full word list
+        if len(filtered_ids) == len(self.words):
+            self.last_search = stats
+            return OPENING_GUESS, self.entropy(OPENING_GUESS, self.words), filtered_ids
+
+        # Turn two is a lookup when the filtered words are exactly one of the book's candidate lists
+        if self.opening_book is not None:
+            hit = self.opening_book.reply(filtered_ids)
+            if hit is not None:
+                self.last_search = stats
+                return hit[0], hit[1], filtered_ids
+
+        # A set of answers seen before (in any game, session or earlier run) is a lookup
+        if self.cache is not None:
+            hit = self.cache.get(filtered_ids)
+            if hit is not None:
+                self.last_search = stats
+                return hit[0], hit[1], filtered_ids
+
+        start = time.time()
     
-    # Strategy: when few possible answers remain, only consider those for guessing
-    # This ensures we don't pick obscure words when the answer pool is small
-    if len(filtered_words) < POSSIBLE_ANSWERS_THRESHOLD:
-        print("Guessing")
-        candidates = filtered_words
-        total_candidates = len(filtered_words)
-    else:
-        print("Eliminating")
-        candidates = WORDS
-        total_candidates = total
+        # Strategy: when few possible answers remain, only consider those for guessing
+        # This ensures we don't pick obscure words when the answer pool is small
+        if len(filtered_ids) < POSSIBLE_ANSWERS_THRESHOLD:
+            if self.verbose:
+                print("Guessing")
+            candidate_ids = filtered_ids
+            total_candidates = len(filtered_ids)
+        else:
+            if self.verbose:
+                print("Eliminating")
+            candidate_ids = self.table.all_ids
+            total_candidates = total
+
+        stats.candidates = total_candidates
+
+        # Guesses that split the answers identically are scored once, through their first member
+        if self.dedupe:
+            candidate_ids = self.distinct_candidates(candidate_ids, filtered_ids)
+            stats.duplicates = total_candidates - len(candidate_ids)
+            total_candidates = len(candidate_ids)
     
-    # Update at most ~100 times to avoid slowing down the loop with prints
-    update_interval = max(1, total_candidates // 100)
-
-    for idx, word in enumerate(candidates, start=1):
-        ent = entropy(word, filtered_words)
-        if ent > max_entropy:
-            max_entropy = ent
-            best_guess = word
-
-        # Show progress
-        if show_progress and (idx % update_interval == 0 or idx == total_candidates):
+        def report(idx):
             elapsed = time.time() - start
             rate = idx / elapsed if elapsed > 0 else 0
             remaining = (total_candidates - idx) / rate if rate > 0 else 0
@@ -309,16 +777,41 @@ def next_guess(possible_words=WORDS, green: dict | None = None, yellow: dict | N
             sys.stdout.write(f"\rComputing entropies: {idx}/{total_candidates} ({pct:.1f}%) ETA {remaining:.1f}s")
             sys.stdout.flush()
 
-    if show_progress:
-        # clear the progress line
-        sys.stdout.write("\r" + " " * 80 + "\r")
-        sys.stdout.flush()
+        if time_budget is not None or self.prune:
+            deadline = called + time_budget if time_budget is not None else None
+            best, max_entropy = self._search(candidate_ids, filtered_ids, stats, deadline, progress=report if show_progress else None)
+            best_guess = self.words[candidate_ids[best]]
+        else:
+            # Score every candidate in one batched pass; argmax keeps the first of equal maxima
+            if histograms is not None:
+                scores = histograms.entropies(candidate_ids, filtered_ids)
+            elif self.parallel is not None and self.parallel.worthwhile(len(candidate_ids), len(filtered_ids)):
+                scores = self.parallel.entropies(candidate_ids, filtered_ids, progress=report if show_progress else None)
+            else:
+                scores = self.entropies_ids(candidate_ids, filtered_ids, progress=report if show_progress else None)
+            best = int(np.argmax(scores))
+            best_guess = self.words[candidate_ids[best]]
+            max_entropy = float(scores[best])
+            stats.evaluated = total_candidates
+
+        if show_progress:
+            # clear the progress line
+            sys.stdout.write("\r" + " " * 80 + "\r")
+            sys.stdout.flush()
+
+        if best_guess is None:
+            print("No valid guess found!")
+            exit(1)
+
+        # A search cut short by its time budget may not have found the best guess
+        if self.cache is not None and stats.completed:
+            self.cache.put(filtered_ids, best_guess, max_entropy)
 
-    if best_guess is None:
-        print("No valid guess found!")
-        exit(1)
+        if instrument.enabled:
+            instrument.search(stats, time.time() - called)
 
-    return best_guess, max_entropy, filtered_words
+        self.last_search = stats
+        return best_guess, max_entropy, filtered_ids
 
 
 def update_colours(new_green, new_yellow, new_gray, green, yellow, gray, min_required) -> tuple[dict, dict, set, Counter]:
@@ -368,4 +861,82 @@ def update_colours(new_green, new_yellow, new_gray, green, yellow, gray, min_req
         if cnt > prev:
             min_required[letter] = cnt
 
-    return green, yellow, gray, min_required
\ No newline at end of file
+    return green, yellow, gray, min_required
+
+
+class GameState:
+    """
+    The state of one game: the surviving words, as an index array into the
+    solver's word list, plus the accumulated green/yellow/gray/min_required
+    constraints, over a shared Solver.
+    """
+
+    def __init__(self, solver: Solver):
+        self.solver = solver
+        # Shared read-only view of the whole list; narrowing always makes a new array
+        self.ids = solver.table.all_ids
+        self.green = {}
+        self.yellow = {}
+        self.gray = set()
+        self.min_required = {}
+        # (guess, code) pairs played so far, used to follow the solver's policy tree
+        self.history = []
+        # Pattern histograms carried between turns when the solver is incremental
+        self.histograms = PatternHistograms(solver) if solver.incremental else None
+
+    def copy(self) -> "GameState":
+        """Return an independent copy of this state sharing the same solver."""
+        other = GameState.__new__(GameState)
+        other.solver = self.solver
+        other.ids = self.ids
+        other.green = dict(self.green)
+        other.yellow = {letter: set(positions) for letter, positions in self.yellow.items()}
+        other.gray = set(self.gray)
+        other.min_required = dict(self.min_required)
+        other.history = list(self.history)
+        other.histograms = PatternHistograms(self.solver) if self.histograms is not None else None
+        return other
+
+    @property
+    def possible_words(self) -> list[str]:
+        """The surviving words, in word list order."""
+        return self.solver.table.subset(self.ids)
+
+    @possible_words.setter
+    def possible_words(self, words: list[str]) -> None:
+        ids = self.solver.ids(words)
+        if ids is None:
+            raise ValueError("possible_words must be words from the solver's word list")
+        self.ids = ids
+
+    def update(self, new_green, new_yellow, new_gray) -> None:
+        """Fold the feedback from one or more guesses into the constraints (see update_colours)."""
+        self.green, self.yellow, self.gray, self.min_required = update_colours(
+            new_green, new_yellow, new_gray, self.green, self.yellow, self.gray, self.min_required
+        )
+
+    def apply(self, guess, code) -> None:
+        """Record the feedback code of a played guess and fold it into the constraints."""
+        self.history.append((guess, code))
+        self.update(*decode_feedback(guess, code))
+
+    def next_guess(self, show_progress=False, time_budget: float | None = None) -> tuple[str, float]:
+        """
+        Compute the next guess for this game and narrow its surviving words to the filtered ones.
+        time_budget bounds a live computation (see Solver.next_guess).
+        While the history follows the solver's policy tree the guess is a lookup;
+        otherwise it is computed live.
+        """
+
+        if self.solver.policy is not None:
+            hit = self.solver.policy.lookup(self.history)
+            if hit is not None:
+                self.solver.last_search = SearchStats()
+                self.ids = self.solver.filter_ids(self.ids, self.green, self.yellow, self.gray, min_required=self.min_required)
+                return hit
+
+        guess, ent, self.ids = self.solver.next_guess_ids(
+            self.ids, self.green, self.yellow, self.gray, min_required=self.min_required,
+            show_progress=show_progress, time_budget=time_budget, histograms=self.histograms
+        )
+        return guess, ent
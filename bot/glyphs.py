@@ -0,0 +1,226 @@
+import json
+import os
+import string
+import time
+from typing import Callable, Iterable
+
+import numpy as np
+
+from board import COLUMNS, TILE_PITCH, load_image
+
+# Rows on the board
+ROWS = 6
+
+# Tiles are cropped to the square this far inside their TILE_PITCH cell
+GLYPH_MARGIN = 11
+
+# Side of the downsampled crop compared against the templates
+GLYPH_SIZE = 16
+
+# Crops whose gray levels vary less than this (standard deviation) hold no letter
+BLANK_LEVEL = 10.0
+
+# Tiles matching no template better than this are passed to the fallback reader
+MIN_CONFIDENCE = 0.8
+
+# Default file the learned templates are cached in
+GLYPHS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "glyphs.npz")
+
+GLYPHS_VERSION = 1
+
+
+####################################################################################################
+# TILE FEATURES
+
+def tile_box(row: int, col: int) -> tuple[int, int, int, int]:
+    """The (left, top, right, bottom) pixel box of a tile's crop in a board screenshot."""
+    left, top = col * TILE_PITCH + GLYPH_MARGIN, row * TILE_PITCH + GLYPH_MARGIN
+    side = TILE_PITCH - 2 * GLYPH_MARGIN
+    return left, top, left + side, top + side
+
+def tile_features(image, rows: int = ROWS, columns: int = COLUMNS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The glyph features of every tile of the first rows rows of a board image:
+    each crop in gray levels, downsampled to GLYPH_SIZE x GLYPH_SIZE and
+    normalised to zero mean and unit length, as a (rows, columns, GLYPH_SIZE**2)
+    array, and a (rows, columns) mask of blank tiles.
+    """
+
+    pixels = np.asarray(image)[..., :3].astype(np.float32).mean(axis=-1)
+    side = TILE_PITCH - 2 * GLYPH_MARGIN
+    factor = side // GLYPH_SIZE
+
+    # (rows, TILE_PITCH, columns, TILE_PITCH) cells, cropped and block-averaged in one go
+    cells = pixels[:rows * TILE_PITCH, :columns * TILE_PITCH].reshape(rows, TILE_PITCH, columns, TILE_PITCH)
+    crops = cells[:, GLYPH_MARGIN:GLYPH_MARGIN + factor * GLYPH_SIZE, :, GLYPH_MARGIN:GLYPH_MARGIN + factor * GLYPH_SIZE]
+    small = crops.reshape(rows, GLYPH_SIZE, factor, columns, GLYPH_SIZE, factor).mean(axis=(2, 5))
+    features = small.transpose(0, 2, 1, 3).reshape(rows, columns, GLYPH_SIZE * GLYPH_SIZE)
+
+    features = features - features.mean(axis=-1, keepdims=True)
+    blank = features.std(axis=-1) < BLANK_LEVEL
+    norms = np.linalg.norm(features, axis=-1, keepdims=True)
+    return features / np.maximum(norms, 1e-9), blank
+
+
+####################################################################################################
+# TEMPLATES
+
+class GlyphTemplates:
+    """One averaged feature vector per letter, learned from labelled board screenshots."""
+
+    def __init__(self, letters: str, templates: np.ndarray):
+        self.letters = letters
+        self.templates = templates  # (len(letters), GLYPH_SIZE**2), unit length
+
+    @classmethod
+    def learn(cls, samples: Iterable[tuple[np.ndarray, list[str]]]) -> "GlyphTemplates":
+        """Average the tiles of (image, words on its rows) samples per letter."""
+
+        sums = np.zeros((26, GLYPH_SIZE * GLYPH_SIZE), dtype=np.float64)
+        counts = np.zeros(26, dtype=np.int64)
+        for image, words in samples:
+            features, blank = tile_features(image, len(words))
+            for row, word in enumerate(words):
+                for col, letter in enumerate(word.upper()):
+                    if not blank[row, col]:
+                        sums[ord(letter) - ord("A")] += features[row, col]
+                        counts[ord(letter) - ord("A")] += 1
+
+        seen = counts > 0
+        templates = sums[seen] / counts[seen, None]
+        templates /= np.maximum(np.linalg.norm(templates, axis=1, keepdims=True), 1e-9)
+        letters = "".join(letter for letter, ok in zip(string.ascii_uppercase, seen) if ok)
+        return cls(letters, templates.astype(np.float32))
+
+    def match(self, features: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """The best letter for every feature vector (as an index into letters) and its correlation."""
+        scores = features @ self.templates.T
+        best = scores.argmax(axis=-1)
+        return best, np.take_along_axis(scores, best[..., None], axis=-1)[..., 0]
+
+    def save(self, path: str = GLYPHS) -> None:
+        np.savez(path, version=GLYPHS_VERSION, size=GLYPH_SIZE, letters=self.letters, templates=self.templates)
+
+    @classmethod
+    def load(cls, path: str = GLYPHS) -> "GlyphTemplates | None":
+        """Templates saved by save(), or None if there are none (or they were made for other crops)."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if int(data["version"]) != GLYPHS_VERSION or int(data["size"]) != GLYPH_SIZE:
+                return None
+            return cls(str(data["letters"]), data["templates"])
+
+
+def read_letters(image, templates: GlyphTemplates, fallback: Callable[[object, int, int], str | None] | None = None,
+                 min_confidence: float = MIN_CONFIDENCE) -> tuple[list[list[str]], list[list[float]]]:
+    """
+    Read the letters of a board screenshot, row by row until the first blank row.
+    Returns the grid of uppercase letters and each tile's match confidence.
+    Tiles below min_confidence are read by fallback(image, row, col) when it is
+    given (their confidence is then reported as 0); otherwise the best match stands.
+    """
+
+    features, blank = tile_features(image)
+    best, confidence = templates.match(features)
+
+    grid, confidences = [], []
+    for row in range(ROWS):
+        if blank[row].all():
+            break
+        letters = [templates.letters[i] for i in best[row]]
+        scores = [float(score) for score in confidence[row]]
+        for col in range(len(letters)):
+            if scores[col] < min_confidence and fallback is not None:
+                letters[col] = (fallback(image, row, col) or letters[col]).upper()
+                scores[col] = 0.0
+        grid.append(letters)
+        confidences.append(scores)
+
+    return grid, confidences
+
+
+####################################################################################################
+# FIXTURES
+# Alongside labels.json (see board.py), a fixture directory holds a
+# letters.json mapping each screenshot to the words on its rows. Between them,
+# the boards in fixtures/boards spell every letter, so the default templates
+# can be learned from them. synthetic-dark-4 also only uses letters the others
+# spell, with its glyphs drawn a pixel off, so the tests read it unseen.
+
+def load_letter_fixtures(directory: str) -> list[tuple[str, np.ndarray, list[str]]]:
+    """(name, image, words) for every board in a fixture directory's letters.json."""
+    with open(os.path.join(directory, "letters.json")) as file:
+        labels = json.load(file)
+    return [(name, load_image(os.path.join(directory, name)), words) for name, words in sorted(labels.items())]
+
+def evaluate_letters(fixtures: list[tuple[str, np.ndarray, list[str]]], templates: GlyphTemplates, min_confidence: float = MIN_CONFIDENCE) -> dict:
+    """Read every fixture board; returns letter accuracy, low-confidence tiles and ms per board."""
+
+    low = 0
+
+    def read(image):
+        nonlocal low
+        grid, confidences = read_letters(image, templates, min_confidence=min_confidence)
+        low += sum(score < min_confidence for row in confidences for score in row)
+        return grid
+
+    return {**evaluate_reader(fixtures, read), "low_confidence": low}
+
+def evaluate_reader(fixtures: list[tuple[str, np.ndarray, list[str]]], read: Callable[[np.ndarray], list[list[str]]]) -> dict:
+    """
+    Read every fixture board with read(image), which returns its rows of
+    letters (read_letters, or auto.ocr_wordle_grid to compare against
+    Tesseract); returns letter accuracy and ms per board.
+    """
+
+    correct, total, seconds = 0, 0, 0.0
+    for name, image, words in fixtures:
+        started = time.perf_counter()
+        grid = read(image)
+        seconds += time.perf_counter() - started
+
+        found = ["".join(row).upper() for row in grid] + [""] * len(words)
+        for want, got in zip(words, found):
+            total += len(want)
+            correct += sum(a == b for a, b in zip(want.upper(), got))
+
+    return {"boards": len(fixtures), "tiles": total, "accuracy": correct / max(total, 1),
+            "ms_per_board": seconds * 1000 / max(len(fixtures), 1)}
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from board import FIXTURES
+
+    parser = argparse.ArgumentParser(description="Learn and check the glyph templates used to read board letters")
+    parser.add_argument("directory", nargs="?", default=FIXTURES, help="Fixture directory with a letters.json")
+    parser.add_argument("--templates", type=str, default=GLYPHS, help="Template file to write or check")
+    parser.add_argument("--check", action="store_true", help="Only measure the saved templates on the fixtures")
+    parser.add_argument("--compare-ocr", action="store_true", help="Also measure the Tesseract reader (auto.ocr_wordle_grid) on the fixtures")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.directory, "letters.json")):
+        raise SystemExit(f"No letters.json in {args.directory}: label the words on each board's rows first")
+    fixtures = load_letter_fixtures(args.directory)
+    if args.check:
+        templates = GlyphTemplates.load(args.templates)
+        if templates is None:
+            raise SystemExit(f"No templates at {args.templates}")
+    else:
+        templates = GlyphTemplates.learn((image, words) for _, image, words in fixtures)
+        templates.save(args.templates)
+        print(f"Learned {len(templates.letters)} letters from {len(fixtures)} boards into {args.templates}")
+
+    result = evaluate_letters(fixtures, templates)
+    print(f"{result['boards']} boards, {result['tiles']} tiles: {result['accuracy']:.1%} correct, "
+          f"{result['low_confidence']} below {MIN_CONFIDENCE}, {result['ms_per_board']:.3f} ms per board")
+
+    if args.compare_ocr:
+        from PIL import Image
+
+        from auto import ocr_wordle_grid
+
+        result = evaluate_reader(fixtures, lambda image: ocr_wordle_grid(Image.fromarray(image)))
+        print(f"Tesseract: {result['accuracy']:.1%} correct, {result['ms_per_board']:.3f} ms per board")
@@ -0,0 +1,205 @@
+import contextlib
+import cProfile
+import json
+import time
+from collections import Counter
+
+# Off by default. Hooks in the hot paths check this flag before doing anything,
+# so disabled instrumentation costs one global lookup per hook.
+enabled = False
+
+_sink = None          # file the JSON trace lines are written to (None: keep totals only)
+_game = None          # the game being traced
+_turn = None          # the turn being traced
+_totals = None        # counters and timings over everything since enable()
+_profile_turn = None  # turn number to run under cProfile
+_profile_path = None
+_profiler = None
+
+
+def _new_record(**info) -> dict:
+    return {**info, "counters": Counter(), "seconds": Counter(), "started": time.perf_counter()}
+
+
+def enable(sink=None, profile_turn: int | None = None, profile_path: str | None = None) -> None:
+    """
+    Start counting. With a sink (a writable text file), every finished turn and
+    game is written to it as a JSON line. With profile_turn, that turn of each
+    traced game runs under cProfile and its stats are dumped to profile_path
+    (default: turn-<n>.prof); the first profiled turn wins.
+    """
+
+    global enabled, _sink, _totals, _profile_turn, _profile_path
+    enabled = True
+    _sink = sink
+    _totals = {"counters": Counter(), "seconds": Counter(), "games": 0, "turns": 0, "filter_before": 0, "filter_after": 0}
+    _profile_turn = profile_turn
+    _profile_path = profile_path or (f"turn-{profile_turn}.prof" if profile_turn is not None else None)
+
+
+def disable() -> None:
+    global enabled, _sink, _game, _turn
+    enabled = False
+    _sink = _game = _turn = None
+
+
+####################################################################################################
+# HOOKS (call only when enabled)
+
+def count(name: str, n: int = 1) -> None:
+    _totals["counters"][name] += n
+    if _turn is not None:
+        _turn["counters"][name] += n
+
+
+def add_time(name: str, seconds: float) -> None:
+    _totals["seconds"][name] += seconds
+    if _turn is not None:
+        _turn["seconds"][name] += seconds
+
+
+class _Timer:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        add_time(self.name, time.perf_counter() - self.started)
+        count(self.name)
+        return False
+
+
+_NOT_TIMED = contextlib.nullcontext()
+
+
+def timed(name: str):
+    """Context manager timing a block under name; does nothing while disabled."""
+    return _Timer(name) if enabled else _NOT_TIMED
+
+
+def filter_pass(before: int, after: int, seconds: float) -> None:
+    """Record one constraint filter pass and the candidate counts before and after it."""
+    count("filter_passes")
+    add_time("filter", seconds)
+    _totals["filter_before"] += before
+    _totals["filter_after"] += after
+    if _turn is not None:
+        _turn["filters"].append({"before": before, "after": after, "ms": round(seconds * 1000, 3)})
+
+
+def search(stats, seconds: float) -> None:
+    """Record one next_guess search from its SearchStats."""
+    count("next_guess")
+    count("candidates_evaluated", stats.evaluated)
+    count("candidates_pruned", stats.pruned)
+    add_time("next_guess", seconds)
+    if _turn is not None:
+        _turn["searches"].append({
+            "candidates": stats.candidates, "evaluated": stats.evaluated, "pruned": stats.pruned,
+            "duplicates": stats.duplicates, "completed": stats.completed, "ms": round(seconds * 1000, 3),
+        })
+
+
+####################################################################################################
+# TURNS AND GAMES
+
+def _finish(record: dict) -> dict:
+    started = record.pop("started")
+    record["ms"] = round((time.perf_counter() - started) * 1000, 3)
+    record["seconds"] = {name: round(value, 6) for name, value in record["seconds"].items()}
+    record["counters"] = dict(record["counters"])
+    return record
+
+
+def _emit(record: dict) -> None:
+    if _sink is not None:
+        _sink.write(json.dumps(record) + "\n")
+        _sink.flush()
+
+
+def begin_game(**info) -> None:
+    global _game
+    if enabled:
+        _game = _new_record(type="game", turns=0, **info)
+
+
+def end_game(**info) -> None:
+    global _game
+    if enabled and _game is not None:
+        _game.update(info)
+        _totals["games"] += 1
+        _emit(_finish(_game))
+        _game = None
+
+
+def begin_turn(**info) -> None:
+    global _turn, _profiler
+    if not enabled:
+        return
+    number = _game["turns"] + 1 if _game is not None else _totals["turns"] + 1
+    _turn = _new_record(type="turn", turn=number, filters=[], searches=[], **info)
+    if _profile_turn == number and _profiler is None and _profile_path is not None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def end_turn(**info) -> None:
+    global _turn, _profiler, _profile_path
+    if not enabled or _turn is None:
+        return
+
+    if _profiler is not None and _profile_path is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_profile_path)
+        _turn["profile"] = _profile_path
+        _profile_path = None
+
+    _turn.update(info)
+    _totals["turns"] += 1
+    if _game is not None:
+        _game["turns"] += 1
+        _game["counters"].update(_turn["counters"])
+        _game["seconds"].update(_turn["seconds"])
+    _emit(_finish(_turn))
+    _turn = None
+
+
+####################################################################################################
+# SUMMARY
+
+def summary() -> dict:
+    """Totals since enable(): games, turns, counters and seconds per timer."""
+    if _totals is None:
+        return {}
+    return {
+        "games": _totals["games"], "turns": _totals["turns"],
+        "counters": dict(_totals["counters"]),
+        "seconds": {name: round(value, 6) for name, value in _totals["seconds"].items()},
+    }
+
+
+def format_summary() -> str:
+    """The totals as lines in the style of skilltest's statistics block."""
+
+    totals = summary()
+    if not totals:
+        return ""
+
+    counters, seconds = totals["counters"], totals["seconds"]
+    searches = counters.get("next_guess", 0)
+    passes = counters.get("filter_passes", 0)
+    lines = [
+        f"Instrumented turns: {totals['turns']} over {totals['games']} games",
+        f"feedback calls: {counters.get('feedback', 0)}",
+        f"next_guess searches: {searches} ({seconds.get('next_guess', 0):.3f}s, "
+        f"{counters.get('candidates_evaluated', 0) / max(searches, 1):.0f} candidates evaluated on average, "
+        f"{counters.get('candidates_pruned', 0)} pruned)",
+        f"Filter passes: {passes} ({seconds.get('filter', 0):.3f}s, "
+        f"{_totals['filter_before'] / max(passes, 1):.0f} -> {_totals['filter_after'] / max(passes, 1):.0f} words on average)",
+    ]
+    lines += [f"{name}: {counters.get(name, 0)} calls, {value:.3f}s"
+              for name, value in sorted(seconds.items()) if name not in ("next_guess", "filter")]
+    return "\n".join("        " + line for line in lines)
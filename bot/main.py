@@ -1,23 +1,38 @@
-from entropy import WORDS, next_guess, get_feedback_from_user, update_colours
+import instrument
+from entropy import Solver, get_feedback_from_user, make_parser
+from opening import load_opening_book
+from policy import load_policy
 
 if __name__ == '__main__':
 
-    possible_words = WORDS.copy()
-    green = {}
-    yellow = {}
-    gray = set()
-    min_required = {}
+    parser = make_parser()
+    parser.add_argument("--policy", type=str, default=None, help="Policy tree built by policy.py (default: next to the word list)")
+    parser.add_argument("--opening-book", type=str, default=None, help="Opening book built by opening.py (default: next to the word list)")
+    parser.add_argument("--time-budget", type=float, default=None, help="Seconds a turn may spend searching before returning its best guess so far")
+    args = parser.parse_args()
+
+    solver = Solver.from_args(args)
+    solver.policy = load_policy(solver, args.policy)
+    solver.opening_book = load_opening_book(solver, args.opening_book)
+    game = solver.new_game()
+    instrument.begin_game()
 
     while True:
 
-        new_green, new_yellow, new_gray = get_feedback_from_user()
-        
-        green, yellow, gray, min_required = update_colours(new_green, new_yellow, new_gray, green, yellow, gray, min_required)
+        new_green, new_yellow, new_gray = get_feedback_from_user(game.history)
+
+        # A turn is traced from the entered feedback to the printed guess
+        instrument.begin_turn()
+        game.update(new_green, new_yellow, new_gray)
 
-        print(green, yellow, gray, min_required)
+        print(game.green, game.yellow, game.gray, game.min_required)
 
-        guess, ent, possible_words = next_guess(possible_words, green, yellow, gray, min_required=min_required, show_progress=True)
-        print(f"Next guess: {guess} (Entropy: {ent:.4f}, Possible words left: {len(possible_words)})\n")
+        guess, ent = game.next_guess(show_progress=True, time_budget=args.time_budget)
+        if not solver.last_search.completed:
+            print(f"Time budget reached after {solver.last_search.evaluated}/{solver.last_search.candidates} candidates")
+        print(f"Next guess: {guess} (Entropy: {ent:.4f}, Possible words left: {len(game.ids)})\n")
+        instrument.end_turn(guess=guess, remaining=len(game.ids))
 
-        if len(possible_words) == 1:
-            break
\ No newline at end of file
+        if len(game.ids) == 1:
+            instrument.end_game(guesses=len(game.history) + 1)
+            break
@@ -0,0 +1,219 @@
+import random as rnd
+import sys
+import time
+
+import numpy as np
+
+from entropy import (BATCH_CELLS, OPENING_GUESS, POSSIBLE_ANSWERS_THRESHOLD, Solver,
+                     entropies_from_counts, feedback_code, make_parser)
+from patterns import N_PATTERNS
+from utils import str_to_pattern
+
+# Boards a multi-board game may have (Dordle is 2, Quordle 4, Octordle 8)
+MAX_BOARDS = 8
+
+
+####################################################################################################
+# COMBINED ENTROPY
+# The boards' answers are independent, so the entropy of a guess's feedback on
+# all of them is the sum of its entropy on each. Every candidate's codes
+# against the answers of all unsolved boards are gathered in one block and
+# histogrammed per (candidate, board) in a single bincount, so a turn over
+# eight boards is still one pass over the candidates.
+
+def combined_entropies(solver: Solver, candidate_ids: np.ndarray, answer_sets: list[np.ndarray], progress=None) -> np.ndarray:
+    """
+    The sum over answer_sets of each candidate's entropy over that set of answers.
+    progress, if given, is called with the number of candidates done after each block.
+    """
+
+    boards = len(answer_sets)
+    answers = np.concatenate(answer_sets)
+    # Bucket offset of every gathered column: its board's block of N_PATTERNS
+    board_offsets = np.repeat(np.arange(boards, dtype=np.intp) * N_PATTERNS, [len(ids) for ids in answer_sets])
+
+    # Blocks are bounded both in gathered codes and in histogram buckets
+    step = max(1, BATCH_CELLS // max(len(answers), boards * N_PATTERNS, 1))
+    codes = np.empty((min(step, len(candidate_ids)), len(answers)), dtype=np.uint8)
+    buckets = np.empty(codes.shape, dtype=np.intp)
+    row_offsets = np.arange(codes.shape[0], dtype=np.intp)[:, None] * (boards * N_PATTERNS)
+
+    # The whole list (the usual case) is read as contiguous row slices of the
+    # pattern matrix; anything else gathers only the cells it needs
+    whole_list = len(candidate_ids) == len(solver.words) and np.array_equal(candidate_ids, solver.table.all_ids)
+
+    result = np.empty(len(candidate_ids), dtype=np.float64)
+    for start in range(0, len(candidate_ids), step):
+        stop = min(start + step, len(candidate_ids))
+        rows = stop - start
+        if whole_list:
+            np.take(solver.patterns[start:stop], answers, axis=1, out=codes[:rows])
+        else:
+            codes[:rows] = solver.patterns[np.ix_(candidate_ids[start:stop], answers)]
+        np.add(codes[:rows], board_offsets, out=buckets[:rows])
+        buckets[:rows] += row_offsets[:rows]
+
+        counts = np.bincount(buckets[:rows].ravel(), minlength=rows * boards * N_PATTERNS)
+        result[start:stop] = entropies_from_counts(counts.reshape(rows * boards, N_PATTERNS)).reshape(rows, boards).sum(axis=1)
+        if progress is not None:
+            progress(stop)
+
+    return result
+
+
+class MultiBoardGame:
+    """
+    Several boards answered by the same guesses (Dordle, Quordle, ...). Each
+    board keeps its own GameState over the shared Solver; a board is dropped
+    once a guess comes back all green on it.
+    """
+
+    def __init__(self, solver: Solver, boards: int):
+        if not 1 <= boards <= MAX_BOARDS:
+            raise ValueError(f"a game has 1 to {MAX_BOARDS} boards")
+
+        self.solver = solver
+        self.games = [solver.new_game() for _ in range(boards)]
+        self.solved = [False] * boards
+        self.history = []
+
+    @property
+    def unsolved(self) -> list[int]:
+        return [board for board, solved in enumerate(self.solved) if not solved]
+
+    @property
+    def done(self) -> bool:
+        return all(self.solved)
+
+    def apply(self, guess: str, codes: dict[int, int]) -> None:
+        """
+        Fold a guess's feedback code on every unsolved board (keyed by board) into
+        its constraints. Raises ValueError if no word fits a board any more.
+        """
+
+        solved = 3 ** len(guess) - 1
+        self.history.append((guess, dict(codes)))
+        for board in self.unsolved:
+            game = self.games[board]
+            game.apply(guess, codes[board])
+            if codes[board] == solved:
+                self.solved[board] = True
+                continue
+
+            game.ids = self.solver.filter_ids(game.ids, game.green, game.yellow, game.gray, min_required=game.min_required)
+            if not len(game.ids):
+                raise ValueError(f"no valid words remaining on board {board + 1}")
+
+    def next_guess(self, show_progress=False) -> tuple[str, float]:
+        """
+        The guess with the highest combined entropy over the unsolved boards, and
+        that entropy. A board down to one answer is finished first.
+        """
+
+        solver = self.solver
+        answer_sets = [self.games[board].ids for board in self.unsolved]
+        if not answer_sets:
+            raise ValueError("every board is solved")
+
+        for ids in answer_sets:
+            if len(ids) == 1:
+                return solver.words[ids[0]], float(combined_entropies(solver, ids, answer_sets)[0])
+
+        # Every board starts from the whole list, where the best guess is the single-board opening
+        if all(len(ids) == len(solver.words) for ids in answer_sets):
+            guess = solver.ids([OPENING_GUESS])
+            if guess is not None:
+                return OPENING_GUESS, float(combined_entropies(solver, guess, answer_sets)[0])
+
+        # Strategy: when few possible answers remain, only consider those for guessing
+        if sum(len(ids) for ids in answer_sets) < POSSIBLE_ANSWERS_THRESHOLD:
+            candidate_ids = np.unique(np.concatenate(answer_sets))
+        else:
+            candidate_ids = solver.table.all_ids
+
+        start = time.time()
+
+        def report(idx):
+            elapsed = time.time() - start
+            rate = idx / elapsed if elapsed > 0 else 0
+            remaining = (len(candidate_ids) - idx) / rate if rate > 0 else 0
+            sys.stdout.write(f"\rComputing entropies: {idx}/{len(candidate_ids)} ({idx / len(candidate_ids) * 100:.1f}%) ETA {remaining:.1f}s")
+            sys.stdout.flush()
+
+        scores = combined_entropies(solver, candidate_ids, answer_sets, progress=report if show_progress else None)
+        if show_progress:
+            sys.stdout.write("\r" + " " * 80 + "\r")
+            sys.stdout.flush()
+
+        # argmax keeps the first of equal maxima
+        best = int(np.argmax(scores))
+        return solver.words[candidate_ids[best]], float(scores[best])
+
+
+def play(answers: list[str], solver: Solver, max_turns: int = 20) -> int:
+    """Play one multi-board game against known answers and return the guesses it took (max_turns + 1 if unsolved)."""
+
+    game = MultiBoardGame(solver, len(answers))
+    for turn in range(1, max_turns + 1):
+        guess, _ = game.next_guess()
+        game.apply(guess, {board: feedback_code(guess, answers[board]) for board in game.unsolved})
+        if game.done:
+            return turn
+    return max_turns + 1
+
+
+def get_codes_from_user(guess: str, boards: list[int]) -> dict[int, int]:
+    """Ask for the feedback of guess on each of the given boards."""
+
+    codes = {}
+    for board in boards:
+        while True:
+            user_input = input(f"Board {board + 1} feedback for {guess} (g for green, y for yellow, x for gray): ").strip()
+            try:
+                codes[board] = str_to_pattern(user_input, len(guess))
+            except ValueError:
+                print(f"Invalid input. Please enter a {len(guess)}-character string using 'g', 'y', and 'x'.")
+                continue
+            break
+    return codes
+
+
+if __name__ == '__main__':
+
+    parser = make_parser("Entropy-based solver for multi-board variants (Dordle, Quordle, ...)")
+    parser.add_argument("--boards", type=int, default=4, help=f"Boards answered by each guess (1 to {MAX_BOARDS})")
+    parser.add_argument("--play", type=int, default=None, metavar="GAMES", help="Play this many games against random answers instead of asking for feedback")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the answers of --play")
+    args = parser.parse_args()
+
+    solver = Solver.from_args(args)
+
+    if args.play is not None:
+        rng = rnd.Random(args.seed)
+        turns = []
+        for n in range(args.play):
+            answers = rng.sample(solver.words, args.boards)
+            turns.append(play(answers, solver))
+            print(f"Game {n + 1}: {' '.join(answers)} in {turns[-1]} guesses")
+        print(f"\n        Played {len(turns)} games on {args.boards} boards.")
+        print(f"        Average guesses: {sum(turns) / len(turns):.2f}")
+        print(f"        Max guesses: {max(turns)}")
+        sys.exit(0)
+
+    game = MultiBoardGame(solver, args.boards)
+    while not game.done:
+        guess, ent = game.next_guess(show_progress=True)
+        left = ", ".join(f"{board + 1}: {len(game.games[board].ids)}" for board in game.unsolved)
+        print(f"Next guess: {guess} (Combined entropy: {ent:.4f}, Possible words left: {left})\n")
+
+        codes = get_codes_from_user(guess, game.unsolved)
+        try:
+            game.apply(guess, codes)
+        except ValueError as error:
+            print(error)
+            sys.exit(1)
+        for board in codes:
+            if game.solved[board]:
+                print(f"Board {board + 1} solved in {len(game.history)} guesses")
+
+    print(f"All {args.boards} boards solved in {len(game.history)} guesses")
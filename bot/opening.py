@@ -0,0 +1,193 @@
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+from entropy import (
+    BATCH_CELLS, OPENING_GUESS, POSSIBLE_ANSWERS_THRESHOLD, Solver, entropies_from_counts, feedback_code, make_parser,
+    pattern_counts,
+)
+from patterns import N_PATTERNS, word_list_hash
+
+# Bumped whenever the file layout or the way replies are chosen changes
+BOOK_VERSION = 1
+
+
+def opening_book_path(wordlist_path: str, words: list[str]) -> str:
+    """Default path of the opening book for a word list, keyed by the list's hash."""
+    base, _ = os.path.splitext(wordlist_path)
+    return f"{base}.opening-{word_list_hash(words)[:16]}.npz"
+
+
+class OpeningBook:
+    """
+    The best second guess for every feedback pattern of the opening guess,
+    together with the candidate answers (as word list indices) left after that pattern.
+    The file is only read the first time a reply is looked up.
+    """
+
+    def __init__(self, path: str, words: list[str]):
+        self.path = path
+        self.words = words
+        self._entries = None
+
+    @property
+    def entries(self) -> dict[int, tuple[str, float, np.ndarray]]:
+        """Maps a feedback code of OPENING_GUESS to (reply, entropy, candidates); empty if the book is missing or stale."""
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> dict[int, tuple[str, float, np.ndarray]]:
+        if not os.path.exists(self.path):
+            return {}
+
+        with np.load(self.path) as data:
+            if (int(data["version"]) != BOOK_VERSION
+                    or str(data["word_hash"]) != word_list_hash(self.words)
+                    or str(data["opening"]) != OPENING_GUESS
+                    or int(data["threshold"]) != POSSIBLE_ANSWERS_THRESHOLD):
+                return {}
+
+            entries = {}
+            offsets = data["offsets"]
+            candidates = data["candidates"]
+            for i, (code, reply, ent) in enumerate(zip(data["codes"], data["replies"], data["entropies"])):
+                ids = candidates[offsets[i]:offsets[i + 1]].astype(np.intp)
+                entries[int(code)] = (reply.decode("ascii"), float(ent), ids)
+
+        return entries
+
+    def reply(self, filtered_ids: np.ndarray) -> tuple[str, float] | None:
+        """
+        Return the stored (reply, entropy) if filtered_ids (indices into the
+        word list) are exactly the candidates of one of the opening guess's
+        patterns, else None.
+        """
+
+        if not len(filtered_ids) or not self.entries:
+            return None
+
+        entry = self.entries.get(feedback_code(OPENING_GUESS, self.words[filtered_ids[0]]))
+        if entry is None or not np.array_equal(entry[2], filtered_ids):
+            return None
+        return entry[0], entry[1]
+
+    @staticmethod
+    def save(path: str, solver: Solver, entries: dict[int, tuple[str, float, np.ndarray]]) -> None:
+        """Write entries as flat arrays, with candidates stored as word indices plus offsets."""
+
+        codes = sorted(entries)
+        offsets = np.cumsum([0] + [len(entries[code][2]) for code in codes])
+        candidates = np.concatenate([entries[code][2] for code in codes] or [[]]).astype(np.int32)
+
+        np.savez(
+            path,
+            codes=np.array(codes, dtype=np.uint8),
+            replies=np.array([entries[code][0].encode("ascii") for code in codes]),
+            entropies=np.array([entries[code][1] for code in codes], dtype=np.float64),
+            offsets=offsets.astype(np.int64),
+            candidates=candidates,
+            version=BOOK_VERSION, word_hash=word_list_hash(solver.words),
+            opening=OPENING_GUESS, threshold=POSSIBLE_ANSWERS_THRESHOLD,
+        )
+
+
+def load_opening_book(solver: Solver, path: str | None = None) -> OpeningBook | None:
+    """Attach-ready opening book at path (default: next to the solver's word list); read lazily."""
+    if path is None:
+        if solver.wordlist is None:
+            return None
+        path = opening_book_path(solver.wordlist, solver.words)
+    return OpeningBook(path, solver.words)
+
+
+def build_opening_book(solver: Solver, show_progress=False) -> dict[int, tuple[str, float, np.ndarray]]:
+    """
+    For every pattern some answer can give the opening guess, replay the
+    feedback as main.py does and record next_guess's reply and the candidates.
+    """
+
+    entries = {}
+    codes = np.unique(solver.feedback_codes(OPENING_GUESS, solver.words)).tolist()
+    for done, code in enumerate(codes, start=1):
+        game = solver.new_game()
+        game.apply(OPENING_GUESS, code)
+        filtered = solver.filter_ids(game.ids, game.green, game.yellow, game.gray, min_required=game.min_required)
+        if len(filtered):
+            with contextlib.redirect_stdout(io.StringIO()):
+                reply, ent, filtered = solver.next_guess_ids(filtered, game.green, game.yellow, game.gray, min_required=game.min_required)
+            entries[code] = (reply, ent, filtered)
+
+        if show_progress:
+            sys.stdout.write(f"\rBuilding opening book: {done}/{len(codes)} patterns")
+            sys.stdout.flush()
+
+    if show_progress:
+        sys.stdout.write("\n")
+
+    return entries
+
+
+####################################################################################################
+# OPENER RANKING
+
+def rank_openings(solver: Solver, openers: list[str] | None = None) -> list[tuple[str, float, float, int, int]]:
+    """
+    Score opening words against the whole word list in bulk.
+    Returns (word, entropy, expected candidates left, worst-case candidates left,
+    distinct patterns) for every opener (all words by default), best entropy first.
+    """
+
+    if openers is None:
+        openers = solver.words
+
+    n = len(solver.words)
+    stats = []
+    step = max(1, BATCH_CELLS // max(n, 1))
+    for start in range(0, len(openers), step):
+        block = openers[start:start + step]
+        ids = solver.ids(block)
+        if ids is not None:
+            codes = np.asarray(solver.patterns[ids], dtype=np.intp)
+        else:
+            codes = np.stack([solver.feedback_codes(word, solver.words) for word in block]).astype(np.intp)
+        counts = pattern_counts(codes)
+        entropies = entropies_from_counts(counts)
+        expected = (counts.astype(np.float64) ** 2).sum(axis=1) / n
+        worst = counts.max(axis=1)
+        buckets = (counts > 0).sum(axis=1)
+        for row, word in enumerate(block):
+            stats.append((word, float(entropies[row]), float(expected[row]), int(worst[row]), int(buckets[row])))
+
+    # Stable sort keeps the word list order among equal entropies
+    stats.sort(key=lambda row: -row[1])
+    return stats
+
+
+if __name__ == '__main__':
+
+    parser = make_parser("Build the opening book or rank opening words")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help=f"Store the best reply to every pattern of '{OPENING_GUESS}'")
+    build.add_argument("-o", "--output", type=str, default=None, help="Output path (default: next to the word list)")
+
+    rank = commands.add_parser("rank", help="Rank every word (or the given words) as an opener")
+    rank.add_argument("openers", nargs="*", help="Words to evaluate (default: the whole list)")
+    rank.add_argument("--top", type=int, default=20, help="How many openers to show")
+
+    args = parser.parse_args()
+    solver = Solver.from_args(args)
+
+    if args.command == "build":
+        entries = build_opening_book(solver, show_progress=True)
+        output = args.output or opening_book_path(args.wordlist, solver.words)
+        OpeningBook.save(output, solver, entries)
+        print(f"Saved replies for {len(entries)}/{N_PATTERNS} patterns to {output}")
+    else:
+        print(f"{'opener':<8} {'entropy':>8} {'expected':>9} {'worst':>6} {'patterns':>9}")
+        for word, ent, expected, worst, buckets in rank_openings(solver, args.openers or None)[:args.top]:
+            print(f"{word:<8} {ent:>8.4f} {expected:>9.1f} {worst:>6} {buckets:>9}")
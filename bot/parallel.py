@@ -0,0 +1,123 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+
+import numpy as np
+
+import instrument
+
+# Below this many remaining answers a turn is scored serially: the batched
+# pass is already quick and shipping chunks to workers would cost more
+MIN_ANSWERS = 100
+
+# Chunks handed out per worker when no chunk size is given, so a slow worker
+# does not hold up the merge for long
+CHUNKS_PER_WORKER = 4
+
+
+####################################################################################################
+# WORKERS
+# Each worker builds its own Solver from the word list path once, when the
+# pool starts, and keeps it for every later task. The pattern matrix is
+# memory-mapped from the on-disk cache, so workers share its pages instead of
+# receiving a pickled copy. skilltest.py starts its game pool the same way.
+
+_worker_solver = None
+
+def init_worker(wordlist: str, opening_book: bool = False) -> None:
+    """Pool initializer: build this worker's quiet Solver, with the opening book if asked."""
+    global _worker_solver
+    from entropy import Solver
+
+    # Forked workers must not write into the parent's trace
+    instrument.disable()
+    _worker_solver = Solver(wordlist)
+    _worker_solver.verbose = False
+    _worker_solver.patterns
+    if opening_book:
+        from opening import load_opening_book
+        _worker_solver.opening_book = load_opening_book(_worker_solver)
+
+def worker_solver():
+    """The Solver init_worker built in this worker process."""
+    return _worker_solver
+
+def worker_args(solver, opening_book: bool = False) -> tuple:
+    """The initargs of init_worker for workers loading solver's word list."""
+    # Build (or map) the pattern cache once up front so workers only ever map it
+    solver.patterns
+    return solver.wordlist, opening_book
+
+def _score_chunk(guess_ids: np.ndarray, answer_ids: np.ndarray) -> np.ndarray:
+    return _worker_solver.entropies_ids(guess_ids, answer_ids)
+
+
+class ParallelScorer:
+    """
+    Scores a turn's candidate guesses in chunks across a process pool. The
+    pool is started on first use and kept warm for later turns until close().
+    Chunk scores are put back in candidate order before the caller's argmax,
+    so the guess (and its first-wins tie rule) is the same as a serial pass.
+    """
+
+    def __init__(self, solver, workers: int | None = None, chunk_size: int | None = None, min_answers: int = MIN_ANSWERS):
+        """
+        :param solver: The Solver whose word list the workers load (it must have a wordlist path)
+        :param workers: Worker processes (default: one per CPU)
+        :param chunk_size: Candidates per chunk (default: spread over CHUNKS_PER_WORKER chunks per worker)
+        :param min_answers: Turns with fewer remaining answers are scored serially
+        """
+
+        if solver.wordlist is None:
+            raise ValueError("parallel scoring needs a solver loaded from a word list file")
+
+        self.solver = solver
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.min_answers = min_answers
+        self._pool = None
+
+    def worthwhile(self, candidates: int, answers: int) -> bool:
+        """Whether a turn is big enough to score across the pool."""
+        return self.workers > 1 and answers >= self.min_answers and candidates > 1
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, initializer=init_worker, initargs=worker_args(self.solver))
+        return self._pool
+
+    def chunks(self, n: int) -> list[tuple[int, int]]:
+        """The (start, stop) ranges n candidates are split into."""
+        size = self.chunk_size or -(-n // (self.workers * CHUNKS_PER_WORKER))
+        size = max(1, size)
+        return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+    def entropies(self, guess_ids: np.ndarray, answer_ids: np.ndarray, progress=None) -> np.ndarray:
+        """
+        Solver.entropies_ids across the pool. progress, if given, is called
+        with the number of guesses scored so far as each chunk comes back.
+        """
+
+        result = np.empty(len(guess_ids), dtype=np.float64)
+        futures = {
+            self.pool.submit(_score_chunk, guess_ids[start:stop], answer_ids): (start, stop)
+            for start, stop in self.chunks(len(guess_ids))
+        }
+        if instrument.enabled:
+            instrument.count("parallel_chunks", len(futures))
+
+        done = 0
+        for future in as_completed(futures):
+            start, stop = futures[future]
+            result[start:stop] = future.result()
+            done += stop - start
+            if progress is not None:
+                progress(done)
+
+        return result
+
+    def close(self) -> None:
+        """Shut the worker pool down (a later turn starts a new one)."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
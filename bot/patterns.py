@@ -0,0 +1,105 @@
+import hashlib
+import os
+
+import numpy as np
+
+# Number of distinct feedback patterns for 5-letter words (3 ** 5)
+N_PATTERNS = 243
+
+# Guesses processed per vectorized block when building the matrix
+BLOCK_SIZE = 256
+
+
+def encode_words(words: list[str]) -> np.ndarray:
+    """Encode a list of equal-length lowercase words as an (N, n) uint8 array of letter indices (a=0)."""
+    if not words:
+        return np.zeros((0, 5), dtype=np.uint8)
+    raw = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+    return (raw.reshape(len(words), -1) - ord("a")).astype(np.uint8)
+
+
+def word_list_hash(words: list[str]) -> str:
+    """Return a stable hex digest identifying the contents and order of a word list."""
+    return hashlib.sha1("\n".join(words).encode("ascii")).hexdigest()
+
+
+####################################################################################################
+# PATTERN MATRIX
+
+def compute_patterns(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """
+    Compute the feedback code of every guess against every answer.
+    Both arguments are encoded word arrays (see encode_words). Returns a
+    (len(guesses), len(answers)) uint8 array of base-3 codes, using the same
+    encoding as entropy.feedback (MSB at pos 0, 2=green, 1=yellow, 0=gray).
+    """
+
+    n_guesses, n = guesses.shape
+    out = np.empty((n_guesses, len(answers)), dtype=np.uint8)
+
+    for start in range(0, n_guesses, BLOCK_SIZE):
+        block = guesses[start:start + BLOCK_SIZE]
+
+        # (block, answers, n) - True where guess letter matches answer letter in place
+        green = block[:, None, :] == answers[None, :, :]
+        not_green = ~green
+
+        codes = np.zeros((len(block), len(answers)), dtype=np.uint8)
+        for i in range(n):
+            letter = block[:, i][:, None]
+
+            # Occurrences of this letter among the answer's non-green positions
+            available = np.zeros(codes.shape, dtype=np.uint8)
+            for j in range(n):
+                available += (answers[None, :, j] == letter) & not_green[:, :, j]
+
+            # Earlier non-green occurrences of the same letter in the guess
+            # consume those occurrences first (left-to-right, as in feedback)
+            used = np.zeros(codes.shape, dtype=np.uint8)
+            for j in range(i):
+                used += (block[:, j] == block[:, i])[:, None] & not_green[:, :, j]
+
+            yellow = not_green[:, :, i] & (available > used)
+            codes = codes * 3 + green[:, :, i] * 2 + yellow
+
+        out[start:start + len(block)] = codes
+
+    return out
+
+
+def pattern_cache_path(wordlist_path: str, words: list[str]) -> str:
+    """Path of the cached pattern matrix for a word list, keyed by the list's hash."""
+    base, _ = os.path.splitext(wordlist_path)
+    return f"{base}.patterns-{word_list_hash(words)[:16]}.npy"
+
+
+def load_pattern_matrix(words: list[str], wordlist_path: str | None = None) -> np.ndarray:
+    """
+    Return the (N, N) pattern matrix of words against themselves.
+    When wordlist_path is given, the matrix is cached next to the word list
+    and memory-mapped on later runs; a cache whose hash no longer matches the
+    list is simply never looked up again.
+    """
+
+    if wordlist_path is not None:
+        path = pattern_cache_path(wordlist_path, words)
+        if os.path.exists(path):
+            matrix = np.load(path, mmap_mode="r")
+            if matrix.shape == (len(words), len(words)):
+                return matrix
+
+    encoded = encode_words(words)
+    matrix = compute_patterns(encoded, encoded)
+
+    if wordlist_path is not None:
+        # Write to a temporary file first so a half-written cache is never loaded
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                np.save(file, matrix)
+            os.replace(tmp_path, path)
+        except OSError:
+            return matrix
+        return np.load(path, mmap_mode="r")
+
+    return matrix
@@ -0,0 +1,159 @@
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+from entropy import OPENING_GUESS, POSSIBLE_ANSWERS_THRESHOLD, GameState, Solver, make_parser
+from patterns import word_list_hash
+
+# Code of an all-green pattern for 5-letter words
+SOLVED_CODE = 242
+
+# Deepest turn recorded in the tree (guards against states that never narrow down)
+MAX_DEPTH = 12
+
+
+def policy_path(wordlist_path: str, words: list[str]) -> str:
+    """Default path of the policy tree for a word list, keyed by the list's hash."""
+    base, _ = os.path.splitext(wordlist_path)
+    return f"{base}.policy-{word_list_hash(words)[:16]}.npz"
+
+
+class PolicyTree:
+    """
+    The guess next_guess would make at every reachable state of a game,
+    keyed by the history of feedback codes since the opening guess.
+    """
+
+    def __init__(self, nodes: dict[bytes, tuple[str, float]]):
+        """
+        :param nodes: Maps the bytes of the code history (b"" for the opening
+            turn) to the (guess, entropy) next_guess returns at that state
+        """
+        self.nodes = nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def lookup(self, history: list[tuple[str, int]]) -> tuple[str, float] | None:
+        """
+        Return the (guess, entropy) for the state reached by history, a list
+        of (guess, code) pairs, or None if the history leaves the tree (for
+        example after a guess the tree would not have made).
+        """
+
+        key = bytes(code for _, code in history)
+        if key not in self.nodes:
+            return None
+
+        for turn, (guess, _) in enumerate(history):
+            if self.nodes[key[:turn]][0] != guess:
+                return None
+
+        return self.nodes[key]
+
+    def save(self, path: str, words: list[str]) -> None:
+        """Serialize the tree as parent/code/guess/entropy arrays, one row per node."""
+
+        keys = sorted(self.nodes, key=lambda key: (len(key), key))
+        row = {key: idx for idx, key in enumerate(keys)}
+
+        parents = np.array([row[key[:-1]] if key else -1 for key in keys], dtype=np.int32)
+        codes = np.array([key[-1] if key else 0 for key in keys], dtype=np.uint8)
+        guesses = np.array([self.nodes[key][0].encode("ascii") for key in keys])
+        entropies = np.array([self.nodes[key][1] for key in keys], dtype=np.float64)
+
+        np.savez(
+            path,
+            parents=parents, codes=codes, guesses=guesses, entropies=entropies,
+            word_hash=word_list_hash(words), opening=OPENING_GUESS, threshold=POSSIBLE_ANSWERS_THRESHOLD,
+        )
+
+    @classmethod
+    def load(cls, path: str, words: list[str]) -> "PolicyTree | None":
+        """Load a saved tree, or return None if it is missing or was built for another word list or strategy."""
+
+        if not os.path.exists(path):
+            return None
+
+        with np.load(path) as data:
+            if (str(data["word_hash"]) != word_list_hash(words)
+                    or str(data["opening"]) != OPENING_GUESS
+                    or int(data["threshold"]) != POSSIBLE_ANSWERS_THRESHOLD):
+                return None
+
+            keys = []
+            nodes = {}
+            for parent, code, guess, ent in zip(data["parents"], data["codes"], data["guesses"], data["entropies"]):
+                key = keys[parent] + bytes([code]) if parent >= 0 else b""
+                keys.append(key)
+                nodes[key] = (guess.decode("ascii"), float(ent))
+
+        return cls(nodes)
+
+
+def load_policy(solver: Solver, path: str | None = None) -> PolicyTree | None:
+    """Load the policy tree at path (default: next to the solver's word list), if there is one."""
+    if path is None:
+        if solver.wordlist is None:
+            return None
+        path = policy_path(solver.wordlist, solver.words)
+    return PolicyTree.load(path, solver.words)
+
+
+def build_policy(solver: Solver, show_progress=False) -> PolicyTree:
+    """
+    Walk the full decision tree from the opening guess, replaying every
+    feedback pattern that some answer can produce exactly as main.py and
+    auto.py would (update_colours, then next_guess with min_required).
+    """
+
+    nodes = {}
+
+    def visit(game: GameState, key: bytes, answer_ids: np.ndarray) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            guess, ent = game.next_guess()
+        nodes[key] = (guess, ent)
+
+        if show_progress and len(nodes) % 50 == 0:
+            sys.stdout.write(f"\rBuilding policy tree: {len(nodes)} nodes")
+            sys.stdout.flush()
+
+        if len(game.ids) == 1 or len(key) + 1 >= MAX_DEPTH:
+            return
+
+        codes = solver.feedback_codes(guess, [solver.words[i] for i in answer_ids])
+        for code in np.unique(codes).tolist():
+            if code == SOLVED_CODE:
+                continue
+
+            child = game.copy()
+            child.apply(guess, code)
+            # States the live solver cannot continue from (it would exit) are left out
+            if not len(solver.filter_ids(child.ids, child.green, child.yellow, child.gray, min_required=child.min_required)):
+                continue
+            visit(child, key + bytes([code]), answer_ids[codes == code])
+
+    visit(solver.new_game(), b"", np.arange(len(solver.words)))
+
+    if show_progress:
+        sys.stdout.write("\r" + " " * 80 + "\r")
+        sys.stdout.flush()
+
+    return PolicyTree(nodes)
+
+
+if __name__ == '__main__':
+
+    parser = make_parser("Build the precomputed strategy tree for a word list")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Output path (default: next to the word list)")
+    args = parser.parse_args()
+
+    solver = Solver.from_args(args)
+    tree = build_policy(solver, show_progress=True)
+
+    output = args.output or policy_path(args.wordlist, solver.words)
+    tree.save(output, solver.words)
+    print(f"Saved {len(tree)} nodes to {output}")
@@ -0,0 +1,203 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+import functools
+import itertools
+import json
+import time
+
+import numpy as np
+
+from entropy import GameState, Solver, make_parser
+from opening import load_opening_book
+from policy import load_policy
+from utils import str_to_pattern
+
+# Latency samples kept per endpoint for the percentiles
+LATENCY_WINDOW = 10000
+
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyStats:
+    """Rolling request latencies per endpoint."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        if endpoint not in self.samples:
+            self.samples[endpoint] = deque(maxlen=self.window)
+            self.counts[endpoint] = 0
+        self.samples[endpoint].append(seconds)
+        self.counts[endpoint] += 1
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Request count and latency percentiles (in milliseconds, over the window) per endpoint."""
+        summary = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            values = np.percentile(np.fromiter(samples, dtype=np.float64) * 1000, PERCENTILES)
+            summary[endpoint] = {"count": self.counts[endpoint]}
+            summary[endpoint].update({f"p{p}_ms": round(float(v), 3) for p, v in zip(PERCENTILES, values)})
+        return summary
+
+
+class Session:
+    """One game hosted by the service. The lock keeps a session's requests in order."""
+
+    def __init__(self, game: GameState):
+        self.game = game
+        self.lock = asyncio.Lock()
+
+
+class SolverService:
+    """
+    Hosts many concurrent game sessions over one shared Solver. Each session
+    holds its own GameState (green/yellow/gray/min_required from update_colours);
+    the word table, pattern matrix, index, policy tree and opening book are
+    shared read-only. next_guess runs in an executor so a slow turn in one
+    session does not hold up the others.
+
+    Requests and responses are dicts (one JSON object per line over the socket):
+    - {"op": "new"} -> {"session": id}
+    - {"op": "guess", "session": id} -> {"guess", "entropy", "remaining"}
+    - {"op": "feedback", "session": id, "guess": word, "pattern": "xyg.."} -> {"remaining"}
+      (pattern as typed into main.py: g green, y yellow, x gray)
+    - {"op": "close", "session": id} -> {}
+    - {"op": "stats"} -> {"sessions", "latency": {op: {"count", "p50_ms", ...}}}
+    Every response has "ok", plus "error" when it is false, and echoes the request's "id".
+    """
+
+    def __init__(self, solver: Solver, executor: Executor | None = None, time_budget: float | None = None):
+        self.solver = solver
+        self.executor = executor
+        self.time_budget = time_budget
+        self.sessions = {}
+        self.latency = LatencyStats()
+        self._session_ids = itertools.count(1)
+
+        # Sessions share the solver from several threads: build everything lazy up front
+        # and keep next_guess quiet. (solver.last_search belongs to whichever call
+        # returned last, so it is not reported here.)
+        solver.verbose = False
+        solver.table, solver.index, solver.patterns
+
+    async def handle(self, request: dict) -> dict:
+        """Answer one request, recording its latency under its op."""
+
+        started = time.perf_counter()
+        op = request.get("op") if isinstance(request, dict) else None
+        handler = getattr(self, f"_op_{op}", None) if isinstance(op, str) else None
+
+        try:
+            if handler is None:
+                raise ValueError(f"unknown op {op!r}")
+            response = {"ok": True, **await handler(request)}
+        except (KeyError, ValueError) as error:
+            response = {"ok": False, "error": str(error).strip("'\"")}
+
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        self.latency.record(op if handler is not None else "invalid", time.perf_counter() - started)
+        return response
+
+    def _session(self, request: dict) -> Session:
+        session = self.sessions.get(request.get("session"))
+        if session is None:
+            raise KeyError(f"no session {request.get('session')!r}")
+        return session
+
+    async def _op_new(self, request: dict) -> dict:
+        session_id = str(next(self._session_ids))
+        self.sessions[session_id] = Session(self.solver.new_game())
+        return {"session": session_id}
+
+    async def _op_guess(self, request: dict) -> dict:
+        session = self._session(request)
+        async with session.lock:
+            loop = asyncio.get_running_loop()
+            guess, ent = await loop.run_in_executor(
+                self.executor, functools.partial(session.game.next_guess, time_budget=self.time_budget)
+            )
+            return {"guess": guess, "entropy": ent, "remaining": len(session.game.ids)}
+
+    async def _op_feedback(self, request: dict) -> dict:
+        session = self._session(request)
+        guess = str(request["guess"]).lower()
+        length = self.solver.table.length
+        if len(guess) != length or not guess.isascii() or not guess.isalpha():
+            raise ValueError(f"guess must be a word of {length} letters a-z")
+        code = str_to_pattern(str(request["pattern"]), length)
+
+        async with session.lock:
+            # Apply to a copy so feedback no word fits leaves the session as it was
+            game = session.game.copy()
+            game.apply(guess, code)
+            remaining = self.solver.filter_ids(game.ids, game.green, game.yellow, game.gray, min_required=game.min_required)
+            if not len(remaining):
+                raise ValueError("no valid words remaining with the given constraints")
+            game.histograms = session.game.histograms
+            session.game = game
+            return {"remaining": len(remaining)}
+
+    async def _op_close(self, request: dict) -> dict:
+        self._session(request)
+        del self.sessions[request["session"]]
+        return {}
+
+    async def _op_stats(self, request: dict) -> dict:
+        return {"sessions": len(self.sessions), "latency": self.latency.summary()}
+
+
+async def serve(service: SolverService, host: str = "127.0.0.1", port: int = 8765) -> asyncio.Server:
+    """Start a JSON-lines server for service: one request object per line, one response line each."""
+
+    async def client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    response = {"ok": False, "error": "invalid JSON"}
+                else:
+                    response = await service.handle(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(client, host, port)
+
+
+async def main(service: SolverService, host: str, port: int) -> None:
+    server = await serve(service, host, port)
+    print(f"Serving {len(service.solver.words)} words on {host}:{server.sockets[0].getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+
+    parser = make_parser("Serve concurrent solver sessions over a local JSON-lines socket")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--threads", type=int, default=4, help="Threads computing guesses concurrently")
+    parser.add_argument("--policy", type=str, default=None, help="Policy tree built by policy.py (default: next to the word list)")
+    parser.add_argument("--opening-book", type=str, default=None, help="Opening book built by opening.py (default: next to the word list)")
+    parser.add_argument("--time-budget", type=float, default=None, help="Seconds a turn may spend searching before returning its best guess so far")
+    args = parser.parse_args()
+
+    solver = Solver.from_args(args)
+    solver.policy = load_policy(solver, args.policy)
+    solver.opening_book = load_opening_book(solver, args.opening_book)
+
+    with ThreadPoolExecutor(args.threads) as executor:
+        service = SolverService(solver, executor, time_budget=args.time_budget)
+        try:
+            asyncio.run(main(service, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
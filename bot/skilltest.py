@@ -1,78 +1,205 @@
+from collections import Counter
+import multiprocessing as mp
 import random as rnd
+import sys
 
-from entropy import WORDS, feedback, next_guess, filter_words, update_colours
+import numpy as np
+
+import instrument
+from entropy import GameState, Solver, decode_feedback, feedback_code, make_parser
+from opening import load_opening_book
+from parallel import init_worker, worker_args, worker_solver
 from utils import pattern_to_str
 
 
 ####################################################################################################
 
 
-def play(answer: str) -> int:
+def play(answer: str, solver: Solver, verbose: bool = True) -> int:
     """
     Simulates a game of Wordle with the given answer.
     The bot makes guesses until it finds the answer.
     :param answer: The correct answer word.
+    :param solver: The solver holding the word list.
+    :param verbose: Print each guess and its feedback.
     :return: The number of guesses taken to find the answer.
     """
-    possible_words = WORDS.copy()
-    green = {}
-    yellow = {}
-    gray = set()
-    # Minimum required occurrences for letters (derived per-guess)
-    min_required = {}
+    game = solver.new_game()
+    instrument.begin_game(answer=answer)
 
     guesses = 0
 
-    while len(possible_words) > 1:
-        guess, ent, possible_words = next_guess(possible_words, green, yellow, gray, show_progress=True)
-        print(f"Next guess: {guess} (Entropy: {ent:.4f}, Possible words left: {len(possible_words)})")
+    while len(game.ids) > 1:
+        instrument.begin_turn()
+        guess, ent, game.ids = solver.next_guess_ids(game.ids, game.green, game.yellow, game.gray, show_progress=verbose)
+        if verbose:
+            print(f"Next guess: {guess} (Entropy: {ent:.4f}, Possible words left: {len(game.ids)})")
 
         guesses += 1
-        code, new_green, new_yellow, new_gray = feedback(guess, answer)
-        print("Feedback:", pattern_to_str(code), "\n")
+        code = feedback_code(guess, answer)
+        new_green, new_yellow, new_gray = decode_feedback(guess, code)
+        if verbose:
+            print("Feedback:", pattern_to_str(code), "\n")
+
+        game.update(new_green, new_yellow, new_gray)
 
-        green, yellow, gray, min_required = update_colours(new_green, new_yellow, new_gray, green, yellow, gray, min_required)
+        if len(game.ids) == len(solver.words):
+            game.ids = solver.filter_ids(game.ids, game.green, game.yellow, game.gray, min_required=game.min_required)
+        instrument.end_turn(guess=guess, remaining=len(game.ids))
 
-        if len(possible_words) == len(WORDS):
-            possible_words = filter_words(possible_words, green, yellow, gray, min_required=min_required)
-    
+    instrument.end_game(answer=answer, guesses=guesses)
     return guesses
-        
 
-def play_all(n: int) -> None:
+
+####################################################################################################
+# PARALLEL EVALUATION
+# Workers are started by parallel.init_worker, so each maps the shared
+# pattern matrix and loads the opening book itself.
+
+def _play_quiet(answer: str) -> tuple[int, str] | None:
+    """Play one game in a worker; None if the solver gave up (it exits in a sequential run)."""
+    try:
+        return play(answer, worker_solver(), verbose=False), answer
+    except SystemExit:
+        return None
+
+def _progress_bar(done: int, total: int, width: int = 40) -> None:
+    filled = width * done // total
+    sys.stdout.write(f"\r[{'#' * filled}{'.' * (width - filled)}] {done}/{total} games")
+    sys.stdout.flush()
+
+def play_parallel(answers: list[str], solver: Solver, workers: int) -> list[tuple[int, str]]:
     """
-    Plays a game for each word in the WORDS list.
+    Plays a game for each answer across a process pool, quietly, with a progress bar.
+    Returns (guesses, answer) pairs in the order of answers, stopping at the first
+    game the solver gives up on, as a sequential run would.
     """
-    words_copy = WORDS.copy()
-    rnd.shuffle(words_copy)
+
+    if solver.wordlist is None:
+        raise ValueError("parallel evaluation needs a solver loaded from a word list file")
+
     results = []
+    chunksize = max(1, len(answers) // (workers * 16))
+    with mp.Pool(workers, initializer=init_worker, initargs=worker_args(solver, opening_book=True)) as pool:
+        for result in pool.imap(_play_quiet, answers, chunksize=chunksize):
+            if result is None:
+                break
+            results.append(result)
+            _progress_bar(len(results), len(answers))
+
+    sys.stdout.write("\n")
+    return results
 
+
+####################################################################################################
+# TREE-WALK EVALUATION
+# Answers that share a guess prefix share every next_guess call along it, so
+# instead of replaying one game per answer we group the answers by the feedback
+# pattern of each guess and compute next_guess once per distinct game-tree node.
+
+# Deepest turn explored before the remaining answers are reported as unsolved
+MAX_TURNS = 20
+
+def evaluate_tree(answers: list[str], solver: Solver, show_progress: bool = False) -> tuple[list[tuple[int, str]], list[str], Counter]:
+    """
+    Evaluates every answer in one shared traversal of the game tree, following
+    exactly the same steps as play().
+    :return: (guesses, answer) pairs in the order of answers, the answers the
+        solver gave up on, and the number of game-tree nodes at each depth.
+    """
+
+    guess_counts = {}
+    failed = []
+    nodes_per_depth = Counter()
+
+    def resolve(node_answers: list[str], guesses: int) -> None:
+        for answer in node_answers:
+            guess_counts[answer] = guesses
+        if show_progress:
+            _progress_bar(len(guess_counts) + len(failed), len(answers))
+
+    def visit(game: GameState, node_answers: list[str], depth: int) -> None:
+        # Same loop condition as play(): the game ends once a single word is left
+        if len(game.ids) <= 1:
+            resolve(node_answers, depth - 1)
+            return
+
+        nodes_per_depth[depth] += 1
+        if depth > MAX_TURNS:
+            failed.extend(node_answers)
+            return
+
+        try:
+            guess, _, possible_ids = solver.next_guess_ids(game.ids, game.green, game.yellow, game.gray)
+        except SystemExit:
+            failed.extend(node_answers)
+            return
+
+        if len(possible_ids) <= 1:
+            resolve(node_answers, depth)
+            return
+
+        codes = solver.feedback_codes(guess, node_answers)
+        for code in np.unique(codes).tolist():
+            child = game.copy()
+            child.ids = possible_ids
+            child.update(*decode_feedback(guess, code))
+            if len(child.ids) == len(solver.words):
+                child.ids = solver.filter_ids(child.ids, child.green, child.yellow, child.gray, min_required=child.min_required)
+            visit(child, [answer for answer, c in zip(node_answers, codes) if c == code], depth + 1)
+
+    verbose, solver.verbose = solver.verbose, False
     try:
-        for idx, answer in enumerate(words_copy[:n], start=1):
-            print(f"=== Game {idx}/{len(WORDS)}: Answer is '{answer}' ===\n")
-            results.append((play(answer), answer))
-            print("========================================\n")
+        visit(solver.new_game(), answers, 1)
     finally:
+        solver.verbose = verbose
+        if show_progress:
+            sys.stdout.write("\n")
+
+    results = [(guess_counts[answer], answer) for answer in answers if answer in guess_counts]
+    return results, failed, nodes_per_depth
+
+
+def print_tree_statistics(results: list[tuple[int, str]], failed: list[str], nodes_per_depth: Counter) -> None:
+    """Print the extra statistics of a tree-walk evaluation after the usual summary."""
+
+    print_statistics(results)
 
-        # Print statistics
-        guesses, answers = zip(*results)
-
-        total_games = len(results)
-        total_guesses = sum(guesses)
-        average_guesses = total_guesses / total_games
-        max_guesses = max(guesses)
-        min_guesses = min(guesses)
-
-        # Compute guess distribution
-        guess_distribution = {}
-        for g in guesses:
-            guess_distribution[g] = guess_distribution.get(g, 0) + 1
-        distr = []
-        for k, v in sorted(guess_distribution.items()):
-            distr.append(f"{k} guesses: {v} ({v/total_games*100:.0f}%)")
-        distr_str = " | ".join(distr)
-
-        print(f"""
+    max_guesses = max(guesses for guesses, _ in results)
+    worst = sorted(answer for guesses, answer in results if guesses == max_guesses)
+    depths = " | ".join(f"depth {depth}: {count}" for depth, count in sorted(nodes_per_depth.items()))
+
+    print(f"""        Worst-case answers ({max_guesses} guesses): {", ".join(worst)}
+        next_guess calls (tree nodes): {sum(nodes_per_depth.values())}
+        Depth histogram: {depths}
+        Unsolved answers: {len(failed)}{" (" + ", ".join(failed) + ")" if failed else ""}
+        """)
+
+
+####################################################################################################
+
+
+def print_statistics(results: list[tuple[int, str]]) -> None:
+    """Print the summary of a run from its (guesses, answer) pairs."""
+
+    guesses, answers = zip(*results)
+
+    total_games = len(results)
+    total_guesses = sum(guesses)
+    average_guesses = total_guesses / total_games
+    max_guesses = max(guesses)
+    min_guesses = min(guesses)
+
+    # Compute guess distribution
+    guess_distribution = {}
+    for g in guesses:
+        guess_distribution[g] = guess_distribution.get(g, 0) + 1
+    distr = []
+    for k, v in sorted(guess_distribution.items()):
+        distr.append(f"{k} guesses: {v} ({v/total_games*100:.0f}%)")
+    distr_str = " | ".join(distr)
+
+    print(f"""
               
 ========================================
         Played {total_games} games.
@@ -83,9 +210,45 @@ def play_all(n: int) -> None:
         """)
 
 
+def play_all(n: int, solver: Solver, workers: int = 1, seed: int | None = None, tree: bool = False) -> None:
+    """
+    Plays a game for each of the first n words of the shuffled word list.
+    With workers > 1 the games are spread across a process pool; with tree
+    all answers are evaluated in one shared game-tree traversal instead.
+    """
+    words_copy = solver.words.copy()
+    rnd.Random(seed).shuffle(words_copy)
+    results = []
+
+    if tree:
+        print_tree_statistics(*evaluate_tree(words_copy[:n], solver, show_progress=True))
+        return
+
+    try:
+        if workers > 1:
+            results = play_parallel(words_copy[:n], solver, workers)
+        else:
+            for idx, answer in enumerate(words_copy[:n], start=1):
+                print(f"=== Game {idx}/{len(solver.words)}: Answer is '{answer}' ===\n")
+                results.append((play(answer, solver), answer))
+                print("========================================\n")
+    finally:
+        print_statistics(results)
+        if instrument.enabled:
+            print(instrument.format_summary(), "\n")
+
+
 if __name__ == '__main__':
 
+    parser = make_parser()
+    parser.add_argument("--workers", type=int, default=1, help="Play games across this many processes (quiet, with a progress bar)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the order in which answers are played")
+    parser.add_argument("--tree", action="store_true", help="Evaluate all answers in one shared game-tree traversal")
+    args = parser.parse_args()
+    solver = Solver.from_args(args)
+    solver.opening_book = load_opening_book(solver)
+
     games = int(input("Enter number of games to play (0 for all): "))
-    games = games if games > 0 else len(WORDS)
+    games = games if games > 0 else len(solver.words)
 
-    play_all(games)
\ No newline at end of file
+    play_all(games, solver, workers=args.workers, seed=args.seed, tree=args.tree)
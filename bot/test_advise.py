@@ -0,0 +1,46 @@
+import contextlib
+import io
+import unittest
+
+from advise import AdviceStats, advise, read_records
+from entropy import Solver, feedback_code
+from test_solver import random_words
+from utils import pattern_to_str
+
+
+class TestAdvise(unittest.TestCase):
+    def setUp(self):
+        self.solver = Solver(words=random_words(200, seed=4) + ["raise"])
+        self.solver.verbose = False
+
+    def test_matches_live_games_and_memoizes(self):
+        answer = self.solver.words[50]
+        pattern = pattern_to_str(feedback_code("raise", answer)).lower()
+        lines = [
+            '{"id": 1, "history": []}',
+            '{"id": 2, "history": [["raise", "%s"]]}' % pattern,
+            '[["RAISE", %d]]' % feedback_code("raise", answer),
+            '',
+            'not json',
+            '{"id": 5, "history": [["raise", "gg"]]}',
+        ]
+
+        stats = AdviceStats()
+        results = list(advise(read_records(lines), self.solver, memo_size=1, stats=stats))
+
+        game = self.solver.new_game()
+        game.apply("raise", feedback_code("raise", answer))
+        with contextlib.redirect_stdout(io.StringIO()):
+            guess, ent = game.next_guess()
+
+        self.assertEqual(results[0]["guess"], "raise")
+        self.assertEqual(results[1], {"id": 2, "remaining": len(game.ids), "guess": guess, "entropy": ent})
+        self.assertEqual(results[2], {"remaining": len(game.ids), "guess": guess, "entropy": ent})
+        self.assertIn("error", results[3])
+        self.assertEqual(results[4]["id"], 5)
+        self.assertIn("error", results[4])
+        self.assertEqual((stats.records, stats.computed, stats.memo_hits, stats.errors), (5, 2, 1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
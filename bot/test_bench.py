@@ -0,0 +1,29 @@
+import copy
+import unittest
+
+from bench import compare, run_benchmarks
+from entropy import Solver
+from test_solver import random_words
+
+
+class TestBench(unittest.TestCase):
+    def test_run_and_compare(self):
+        solver = Solver(words=random_words(120, seed=7) + ["raise"])
+        baseline = run_benchmarks(solver, seed=1, games=2, repeat=1, only=["feedback", "next_guess.early", "skilltest.play"])
+        self.assertEqual(set(baseline["results"]), {"feedback", "next_guess.early", "skilltest.play"})
+        self.assertEqual(compare(baseline, baseline), [])
+
+        slower = copy.deepcopy(baseline)
+        slower["results"]["feedback"]["calls_per_second"] /= 2
+        regressions = compare(baseline, slower, threshold=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("feedback"))
+
+        other = copy.deepcopy(baseline)
+        other["meta"]["seed"] = 2
+        with self.assertRaises(ValueError):
+            compare(baseline, other)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import importlib.util
+import time
+import unittest
+
+import numpy as np
+
+import board
+
+GREEN, YELLOW, GRAY, EMPTY = (83, 141, 78), (181, 159, 59), (58, 58, 60), (18, 18, 19)
+
+
+def row_frame(tiles, jitter=0):
+    """A synthetic strip of one board row with each tile filled in one colour."""
+    frame = np.zeros((board.TILE_PITCH, board.TILE_PITCH * board.COLUMNS, 4), dtype=np.uint8)
+    frame[..., :3] = EMPTY
+    frame[..., 3] = 255
+    for col, colour in enumerate(tiles):
+        x = col * board.TILE_PITCH
+        frame[2:-2, x + 2:x + board.TILE_PITCH - 2, :3] = np.clip(np.array(colour) + jitter, 0, 255)
+    return frame
+
+
+class TestStability(unittest.TestCase):
+    def test_classify(self):
+        means = board.tile_means(row_frame([GREEN, YELLOW, GRAY, EMPTY, GREEN], jitter=9))
+        self.assertEqual(means.shape, (1, 5, 3))
+        self.assertEqual(board.ColourClassifier().classify(means), [["green", "yellow", "gray", None, "green"]])
+
+        light = board.ColourClassifier({"green": (106, 170, 100), "yellow": (201, 180, 88), "gray": (120, 124, 126), None: (255, 255, 255)})
+        self.assertEqual(light.classify([[110, 165, 98], [250, 250, 250]]), ["green", None])
+
+    def test_reader_keeps_resolved_rows(self):
+        rows = [[GREEN, GRAY, GRAY, YELLOW, GRAY], [GRAY, GREEN, GREEN, GRAY, YELLOW], [EMPTY] * 5]
+        image = np.concatenate([row_frame(row) for row in rows])
+        reader = board.BoardReader()
+        colours = reader.read(image, 3)
+        self.assertEqual(colours[1], ["gray", "green", "green", "gray", "yellow"])
+        self.assertEqual(colours[2], [None] * 5)
+        self.assertEqual(len(reader.rows), 2)
+
+        # Resolved rows are not sampled again: a blank image still reports them
+        self.assertEqual(reader.read(np.zeros_like(image), 3)[:2], colours[:2])
+
+    def test_evaluate_boards(self):
+        # Colours off the centroids (another display profile) with capture noise
+        shifted = {GREEN: (97, 152, 70), YELLOW: (168, 150, 72), GRAY: (66, 64, 70), EMPTY: (26, 22, 20)}
+        names = {GREEN: "green", YELLOW: "yellow", GRAY: "gray", EMPTY: None}
+        rows = [[YELLOW, GRAY, GRAY, GREEN, GRAY], [GREEN, GREEN, GRAY, GREEN, YELLOW], [GREEN] * 5, [EMPTY] * 5]
+        image = np.concatenate([row_frame([shifted[tile] for tile in row]) for row in rows])
+        image[..., :3] = np.clip(image[..., :3] + np.random.default_rng(1).normal(0, 6, image[..., :3].shape), 0, 255)
+
+        expected = [[names[tile] for tile in row] for row in rows]
+        result = board.evaluate_boards([("shifted", image, expected)])
+        self.assertEqual((result["boards"], result["tiles"], result["accuracy"]), (1, 20, 1.0))
+        self.assertEqual(result["misread"], [])
+        self.assertGreater(result["ms_per_board"], 0)
+
+        # A wrong label is reported by board, row and column
+        expected[0][0] = "green"
+        self.assertEqual(board.evaluate_boards([("shifted", image, expected)])["misread"], ["shifted row 0 col 0: yellow (expected green)"])
+
+    @unittest.skipUnless(importlib.util.find_spec("PIL"), "needs Pillow to load the fixture screenshots")
+    def test_fixtures(self):
+        result = board.evaluate_fixtures(board.FIXTURES)
+        self.assertEqual(result["misread"], [])
+        self.assertGreater(result["tiles"], 0)
+
+    def test_settles_after_flip(self):
+        final = [GREEN, GRAY, YELLOW, GRAY, GREEN]
+        # Tiles reveal one per frame, then the row holds still (with a little capture noise)
+        frames = [row_frame(final[:k] + [EMPTY] * (5 - k)) for k in range(6)]
+        frames += [row_frame(final, jitter=3), row_frame(final), row_frame(final)]
+
+        colours, seen = board.settle(frames)
+        self.assertEqual(colours, ["green", "gray", "yellow", "gray", "green"])
+        self.assertEqual(seen, 7)
+
+        self.assertEqual(board.settle(frames[:6]), (None, 6))
+        self.assertEqual(board.settle(frames, stable_frames=3)[1], 8)
+
+    def test_change_resets(self):
+        frames = [row_frame([GRAY] * 5), row_frame([GREEN] + [GRAY] * 4), row_frame([GREEN] + [GRAY] * 4)]
+        self.assertEqual(board.settle(frames)[1], 3)
+
+    def test_poll_row(self):
+        frames = iter([row_frame([EMPTY] * 5)] * 2 + [row_frame([YELLOW] * 5)] * 5)
+        reading = board.poll_row(lambda: next(frames), interval=0)
+        self.assertTrue(reading.stable)
+        self.assertEqual(reading.frames, 4)
+        self.assertGreaterEqual(reading.latency, reading.grab_seconds + reading.classify_seconds)
+        self.assertGreater(reading.classify_seconds, 0)
+
+        reading = board.poll_row(lambda: row_frame([EMPTY] * 5), timeout=0.05, interval=0.01)
+        self.assertFalse(reading.stable)
+        self.assertGreater(reading.frames, 1)
+
+        def slow_grab():
+            time.sleep(0.02)
+            return row_frame([GREEN] * 5)
+
+        reading = board.poll_row(slow_grab, interval=0)
+        self.assertGreaterEqual(reading.grab_seconds, 0.02 * reading.frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from cache import TranspositionCache
+from entropy import Solver, feedback_code
+from test_solver import random_words
+
+
+class TestTranspositionCache(unittest.TestCase):
+    def setUp(self):
+        self.words = random_words(200, seed=6) + ["raise"]
+
+    def test_lru_and_counters(self):
+        cache = TranspositionCache(self.words, max_entries=2)
+        cache.put(np.array([3, 1]), "aaaaa", 1.0)
+        cache.put(np.array([2]), "bbbbb", 2.0)
+        self.assertEqual(cache.get(np.array([1, 3])), ("aaaaa", 1.0))
+        cache.put(np.array([4]), "ccccc", 3.0)
+
+        self.assertIsNone(cache.get(np.array([2])))
+        self.assertEqual(cache.get(np.array([4])), ("ccccc", 3.0))
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (2, 1, 2))
+
+    def test_persistence_and_invalidation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.npz")
+            cache = TranspositionCache(self.words, path)
+            cache.put(np.array([5, 6]), "raise", 1.5)
+            cache.save()
+
+            self.assertEqual(TranspositionCache(self.words, path).get(np.array([5, 6])), ("raise", 1.5))
+            self.assertIsNone(TranspositionCache(self.words[:-1], path).get(np.array([5, 6])))
+            self.assertIsNone(TranspositionCache(self.words, path, strategy=(4,)).get(np.array([5, 6])))
+
+    def test_solver_results_unchanged(self):
+        plain = Solver(words=self.words)
+        cached = Solver(words=self.words)
+        cached.cache = cached.make_cache()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(2):
+                for answer in self.words[::40]:
+                    games = [plain.new_game(), cached.new_game()]
+                    for game in games:
+                        game.apply("raise", feedback_code("raise", answer))
+                    self.assertEqual(games[0].next_guess(), games[1].next_guess())
+
+        self.assertGreater(cached.cache.hits, 0)
+        self.assertEqual(cached.cache.misses, len(cached.cache))
+
+    def test_overlapping_calls_do_not_store_cut_short_results(self):
+        solver = Solver(words=self.words)
+        solver.cache = solver.make_cache()
+        solver.dedupe = False  # more candidates than the first shortlist, so a zero budget cuts the search short
+        games = [solver.new_game() for _ in range(2)]
+        games[0].apply("raise", feedback_code("raise", self.words[4]))
+        games[1].apply("raise", feedback_code("raise", self.words[8]))
+
+        # Another session's complete search finishes while this one's cut-short search is wrapping up
+        search = solver._search
+        def interleaved(*args, **kwargs):
+            result = search(*args, **kwargs)
+            solver.next_guess_ids(games[1].ids, games[1].green, games[1].yellow, games[1].gray, games[1].min_required)
+            return result
+        solver._search = interleaved
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            solver.next_guess_ids(games[0].ids, games[0].green, games[0].yellow, games[0].gray, games[0].min_required, time_budget=0)
+
+        self.assertFalse(solver.last_search.completed)
+        # Only the other session's complete result was stored
+        self.assertEqual(len(solver.cache), 1)
+        self.assertIsNone(solver.cache.get(solver.filter_ids(games[0].ids, games[0].green, games[0].yellow, games[0].gray, games[0].min_required)))
+
+
+if __name__ == '__main__':
+    unittest.main()
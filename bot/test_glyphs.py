@@ -0,0 +1,95 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import glyphs
+from board import FIXTURES, TILE_PITCH
+
+# The fixture board kept out of template learning (its glyphs sit a pixel off the others')
+HELD_OUT = "synthetic-dark-4.png"
+
+TILE_COLOURS = [(83, 141, 78), (181, 159, 59), (58, 58, 60)]
+rng = np.random.default_rng(4)
+SHAPES = {letter: rng.random((8, 8)) < 0.4 for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"}
+
+
+def render(words, noise=0.0, shapes=SHAPES, seed=0):
+    """A synthetic board screenshot with each letter drawn as its 8x8 shape, scaled up, on a coloured tile."""
+    rnd = np.random.default_rng(seed)
+    image = np.full((430, 360, 3), 18.0)
+    for row, word in enumerate(words):
+        for col, letter in enumerate(word):
+            y, x = row * TILE_PITCH, col * TILE_PITCH
+            image[y + 2:y + 64, x + 2:x + 64] = TILE_COLOURS[(row + col) % 3]
+            glyph = np.kron(shapes[letter], np.ones((4, 4), dtype=bool))
+            image[y + 19:y + 51, x + 19:x + 51][glyph] = 248
+    image += rnd.normal(0, noise, image.shape)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+class TestGlyphs(unittest.TestCase):
+    def setUp(self):
+        words = ["ABCDE", "FGHIJ", "KLMNO", "PQRST", "UVWXY", "ZABCD"]
+        self.templates = glyphs.GlyphTemplates.learn([(render(words, seed=1), words)])
+
+    def test_reads_board(self):
+        grid, confidences = glyphs.read_letters(render(["RAISE", "CLOUT"], noise=6, seed=2), self.templates)
+        self.assertEqual(["".join(row) for row in grid], ["RAISE", "CLOUT"])
+        self.assertGreater(min(min(row) for row in confidences), glyphs.MIN_CONFIDENCE)
+
+        self.assertEqual(glyphs.read_letters(render([]), self.templates), ([], []))
+
+    def test_fallback_for_unknown_glyphs(self):
+        shapes = dict(SHAPES, Q=rng.random((8, 8)) < 0.4)
+        calls = []
+
+        def fallback(image, row, col):
+            calls.append((row, col))
+            return "q"
+
+        grid, confidences = glyphs.read_letters(render(["QUERY"], shapes=shapes), self.templates, fallback=fallback)
+        self.assertEqual(calls, [(0, 0)])
+        self.assertEqual("".join(grid[0]), "QUERY")
+        self.assertEqual(confidences[0][0], 0.0)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "glyphs.npz")
+            self.assertIsNone(glyphs.GlyphTemplates.load(path))
+            self.templates.save(path)
+            loaded = glyphs.GlyphTemplates.load(path)
+            self.assertEqual(loaded.letters, self.templates.letters)
+            self.assertTrue(np.array_equal(loaded.templates, self.templates.templates))
+
+    def test_evaluate(self):
+        fixtures = [("board", render(["CRANE", "BLIMP"], noise=4, seed=5), ["CRANE", "BLIMP"])]
+        result = glyphs.evaluate_letters(fixtures, self.templates)
+        self.assertEqual((result["tiles"], result["accuracy"], result["low_confidence"]), (10, 1.0, 0))
+
+    def test_evaluate_reader(self):
+        fixtures = [("board", render(["CRANE", "BLIMP"]), ["CRANE", "BLIMP"])]
+        result = glyphs.evaluate_reader(fixtures, lambda image: [list("crane"), list("BLXMP")])
+        self.assertEqual((result["boards"], result["tiles"], result["accuracy"]), (1, 10, 0.9))
+        self.assertEqual(glyphs.evaluate_reader(fixtures, lambda image: [])["accuracy"], 0.0)
+
+    @unittest.skipUnless(importlib.util.find_spec("PIL"), "needs Pillow to load the fixture screenshots")
+    def test_stored_boards(self):
+        fixtures = glyphs.load_letter_fixtures(FIXTURES)
+        training = [(image, words) for name, image, words in fixtures if name != HELD_OUT]
+        held_out = [fixture for fixture in fixtures if fixture[0] == HELD_OUT]
+        self.assertEqual(len(held_out), 1)
+
+        templates = glyphs.GlyphTemplates.learn(training)
+        self.assertEqual(templates.letters, "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+        # A board none of the templates were learned from reads back in full
+        grid, _ = glyphs.read_letters(held_out[0][1], templates)
+        self.assertEqual(["".join(row) for row in grid], held_out[0][2])
+        result = glyphs.evaluate_letters(held_out, templates)
+        self.assertEqual((result["accuracy"], result["low_confidence"]), (1.0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
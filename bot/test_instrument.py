@@ -0,0 +1,63 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import instrument
+from entropy import Solver
+from skilltest import play
+from test_solver import random_words
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        self.words = random_words(300, seed=8) + ["raise"]
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "words.txt")
+        with open(path, "w") as file:
+            file.write("\n".join(self.words))
+        self.solver = Solver(path)
+
+    def tearDown(self):
+        instrument.disable()
+        self.tmp.cleanup()
+
+    def test_disabled_by_default(self):
+        self.assertFalse(instrument.enabled)
+        with contextlib.redirect_stdout(io.StringIO()):
+            play(self.words[0], self.solver, verbose=False)
+        self.assertIsNone(instrument._turn)
+
+    def test_trace_lines_and_summary(self):
+        sink = io.StringIO()
+        instrument.enable(sink)
+        with contextlib.redirect_stdout(io.StringIO()):
+            guesses = play(self.words[5], self.solver, verbose=False)
+
+        records = [json.loads(line) for line in sink.getvalue().splitlines()]
+        turns = [record for record in records if record["type"] == "turn"]
+        self.assertEqual(records[-1]["type"], "game")
+        self.assertEqual(records[-1]["guesses"], guesses)
+        self.assertEqual([turn["turn"] for turn in turns], list(range(1, len(turns) + 1)))
+        self.assertTrue(all(turn["filters"] for turn in turns))
+        for turn in turns:
+            for search in turn["searches"]:
+                self.assertEqual(search["evaluated"] + search["pruned"] + search["duplicates"], search["candidates"])
+
+        summary = instrument.summary()
+        self.assertEqual((summary["games"], summary["turns"]), (1, len(turns)))
+        self.assertEqual(summary["counters"]["feedback"], sum(turn["counters"].get("feedback", 0) for turn in turns))
+        self.assertIn("Instrumented turns", instrument.format_summary())
+
+    def test_profile_turn(self):
+        path = os.path.join(self.tmp.name, "turn.prof")
+        instrument.enable(profile_turn=2, profile_path=path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            play(self.words[7], self.solver, verbose=False)
+        self.assertTrue(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
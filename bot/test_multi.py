@@ -0,0 +1,51 @@
+import contextlib
+import io
+import random
+import unittest
+
+import numpy as np
+
+from entropy import Solver, feedback_code
+from multi import MultiBoardGame, combined_entropies, play
+from test_solver import random_words
+
+
+class TestMultiBoard(unittest.TestCase):
+    def setUp(self):
+        self.solver = Solver(words=random_words(300, seed=10) + ["raise"])
+
+    def test_combined_is_sum_of_boards(self):
+        ids = self.solver.table.all_ids
+        answer_sets = [ids[::3], ids[1::7], ids[5:9]]
+        combined = combined_entropies(self.solver, ids, answer_sets)
+        separate = sum(self.solver.entropies_ids(ids, answers) for answers in answer_sets)
+        self.assertTrue(np.allclose(combined, separate, rtol=0, atol=1e-12))
+
+        subset = ids[::-5]
+        self.assertTrue(np.array_equal(combined_entropies(self.solver, subset, answer_sets), combined[subset]))
+
+    def test_solved_boards_are_dropped(self):
+        words = self.solver.words
+        game = MultiBoardGame(self.solver, 2)
+        game.apply(words[3], {0: feedback_code(words[3], words[3]), 1: feedback_code(words[3], words[40])})
+        self.assertEqual(game.unsolved, [1])
+
+        # One board left plays exactly like the single-board solver
+        guess, ent = game.next_guess()
+        single = self.solver.next_guess_ids(game.games[1].ids)
+        self.assertEqual((guess, ent), single[:2])
+
+        with self.assertRaises(ValueError):
+            game.apply(words[3], {1: feedback_code(words[3], words[3]) - 1})
+
+    def test_games_finish(self):
+        rng = random.Random(2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for boards in (2, 4, 8):
+                turns = play(rng.sample(self.solver.words, boards), self.solver)
+                self.assertLessEqual(turns, 20)
+                self.assertGreaterEqual(turns, boards)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from entropy import OPENING_GUESS, Solver, feedback_code
+from opening import OpeningBook, build_opening_book, rank_openings
+from test_solver import random_words
+
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self):
+        self.solver = Solver(words=random_words(200, seed=3) + [OPENING_GUESS])
+
+    def test_replies_match_live_second_turn(self):
+        entries = build_opening_book(self.solver)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "opening.npz")
+            OpeningBook.save(path, self.solver, entries)
+            book = OpeningBook(path, self.solver.words)
+
+            for answer in self.solver.words[::20]:
+                game = self.solver.new_game()
+                game.apply(OPENING_GUESS, feedback_code(OPENING_GUESS, answer))
+                with contextlib.redirect_stdout(io.StringIO()):
+                    guess, ent = game.next_guess()
+                self.assertEqual(book.reply(game.ids), (guess, ent))
+
+            self.assertIsNone(book.reply(self.solver.table.all_ids[:3]))
+
+    def test_rank_openings(self):
+        ranked = rank_openings(self.solver)
+        self.assertEqual(len(ranked), len(self.solver.words))
+        entropies = [ent for _, ent, _, _, _ in ranked]
+        self.assertEqual(entropies, sorted(entropies, reverse=True))
+        self.assertAlmostEqual(rank_openings(self.solver, [OPENING_GUESS])[0][1], self.solver.entropy(OPENING_GUESS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from entropy import Solver, feedback_code
+from parallel import ParallelScorer
+from test_solver import random_words
+
+
+class TestParallelScorer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "words.txt")
+        with open(path, "w") as file:
+            file.write("\n".join(random_words(400, seed=9) + ["raise"]))
+        self.solver = Solver(path)
+        self.solver.verbose = False
+
+    def tearDown(self):
+        if self.solver.parallel is not None:
+            self.solver.parallel.close()
+        self.tmp.cleanup()
+
+    def test_chunks_and_fallback(self):
+        scorer = ParallelScorer(self.solver, workers=2, chunk_size=150)
+        self.assertEqual(scorer.chunks(401), [(0, 150), (150, 300), (300, 401)])
+        self.assertEqual(len(ParallelScorer(self.solver, workers=2).chunks(401)), 8)
+        self.assertFalse(scorer.worthwhile(401, scorer.min_answers - 1))
+        self.assertFalse(ParallelScorer(self.solver, workers=1).worthwhile(401, 1000))
+        self.assertIsNone(scorer._pool)
+
+    def test_matches_serial(self):
+        states = []
+        for answer in self.solver.words[::40]:
+            game = self.solver.new_game()
+            game.apply("raise", feedback_code("raise", answer))
+            states.append(game)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial = [self.solver.next_guess_ids(game.ids, game.green, game.yellow, game.gray, game.min_required) for game in states]
+            self.solver.parallel = ParallelScorer(self.solver, workers=2, chunk_size=37, min_answers=1)
+            parallel = [self.solver.next_guess_ids(game.ids, game.green, game.yellow, game.gray, game.min_required, show_progress=True) for game in states]
+
+        for (guess, ent, ids), (p_guess, p_ent, p_ids) in zip(serial, parallel):
+            self.assertEqual((guess, ent), (p_guess, p_ent))
+            self.assertTrue(np.array_equal(ids, p_ids))
+
+        # Scores come back in candidate order and the pool stays up between turns
+        ids = self.solver.table.all_ids
+        done = []
+        scores = self.solver.parallel.entropies(ids, ids[::3], progress=done.append)
+        self.assertTrue(np.array_equal(scores, self.solver.entropies_ids(ids, ids[::3])))
+        self.assertEqual(done[-1], len(ids))
+        self.assertIsNotNone(self.solver.parallel._pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
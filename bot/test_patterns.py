@@ -0,0 +1,30 @@
+import os
+import tempfile
+import unittest
+
+from patterns import compute_patterns, encode_words, load_pattern_matrix, pattern_cache_path
+
+
+class TestPatternMatrix(unittest.TestCase):
+    def test_known_codes(self):
+        guesses = encode_words(["speed", "abide", "crane"])
+        answers = encode_words(["abide", "raise"])
+        codes = compute_patterns(guesses, answers)
+        # speed/abide: XXYXY, abide/abide: GGGGG, crane/raise: XYYXG
+        self.assertEqual(codes[0, 0], 10)
+        self.assertEqual(codes[1, 0], 242)
+        self.assertEqual(codes[2, 1], 38)
+
+    def test_cache_round_trip(self):
+        words = ["raise", "abide", "speed", "crane"]
+        with tempfile.TemporaryDirectory() as tmp:
+            wordlist = os.path.join(tmp, "words.txt")
+            built = load_pattern_matrix(words, wordlist)
+            self.assertTrue(os.path.exists(pattern_cache_path(wordlist, words)))
+            cached = load_pattern_matrix(words, wordlist)
+            self.assertTrue((built == cached).all())
+            del built, cached
+
+
+if __name__ == '__main__':
+    unittest.main()
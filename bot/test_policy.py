@@ -0,0 +1,51 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from entropy import Solver, feedback_code
+from policy import PolicyTree, build_policy
+from test_solver import random_words
+
+
+def play(solver, answer):
+    game = solver.new_game()
+    guesses = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        while len(game.possible_words) > 1 and len(guesses) < 12:
+            guess, ent = game.next_guess()
+            guesses.append((guess, ent))
+            game.apply(guess, feedback_code(guess, answer))
+    return guesses
+
+
+class TestPolicyTree(unittest.TestCase):
+    def setUp(self):
+        self.words = random_words(200, seed=1) + ["raise"]
+        self.solver = Solver(words=self.words)
+        self.tree = build_policy(self.solver)
+
+    def test_policy_matches_live_play(self):
+        with_policy = Solver(words=self.words)
+        with_policy.policy = self.tree
+        for answer in self.words[::10]:
+            self.assertEqual(play(with_policy, answer), play(self.solver, answer))
+
+    def test_lookup_leaves_tree_after_manual_guess(self):
+        opening, _ = self.tree.lookup([])
+        code = feedback_code(opening, self.words[0])
+        self.assertIsNotNone(self.tree.lookup([(opening, code)]))
+        self.assertIsNone(self.tree.lookup([(self.words[5], code)]))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "policy.npz")
+            self.tree.save(path, self.words)
+            loaded = PolicyTree.load(path, self.words)
+            self.assertEqual(loaded.nodes, self.tree.nodes)
+            self.assertIsNone(PolicyTree.load(path, self.words[1:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
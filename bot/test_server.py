@@ -0,0 +1,106 @@
+import asyncio
+import contextlib
+import io
+import json
+import unittest
+
+from entropy import Solver, feedback_code
+from server import SolverService, serve
+from test_solver import random_words
+from utils import pattern_to_str
+
+
+class TestSolverService(unittest.TestCase):
+    def setUp(self):
+        self.solver = Solver(words=random_words(200, seed=5) + ["raise"])
+
+    def expected_guesses(self, answer):
+        reference = Solver(words=self.solver.words)
+        game = reference.new_game()
+        guesses = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            while len(guesses) < 8:
+                guess, _ = game.next_guess()
+                guesses.append(guess)
+                if guess == answer:
+                    break
+                game.apply(guess, feedback_code(guess, answer))
+        return guesses
+
+    def test_concurrent_sessions_over_socket(self):
+        answers = self.solver.words[10:13]
+
+        async def play(port, answer):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+            async def call(**request):
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                return json.loads(await reader.readline())
+
+            session = (await call(op="new"))["session"]
+            guesses = []
+            while len(guesses) < 8:
+                response = await call(op="guess", session=session)
+                self.assertTrue(response["ok"], response)
+                guesses.append(response["guess"])
+                if response["guess"] == answer:
+                    break
+                pattern = pattern_to_str(feedback_code(response["guess"], answer)).replace("X", "x").lower()
+                self.assertTrue((await call(op="feedback", session=session, guess=response["guess"], pattern=pattern))["ok"])
+
+            bad = await call(op="feedback", session="nope", guess="raise", pattern="xxxxx", id=7)
+            self.assertEqual((bad["ok"], bad["id"]), (False, 7))
+            await call(op="close", session=session)
+            stats = await call(op="stats")
+            writer.close()
+            return guesses, stats
+
+        async def run():
+            service = SolverService(self.solver)
+            server = await serve(service, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                return await asyncio.gather(*(play(port, answer) for answer in answers))
+
+        results = asyncio.run(run())
+        for answer, (guesses, _) in zip(answers, results):
+            self.assertEqual(guesses, self.expected_guesses(answer))
+
+        latency = max((stats for _, stats in results), key=lambda stats: stats["latency"]["guess"]["count"])["latency"]
+        self.assertIn("p99_ms", latency["guess"])
+
+    def test_rejects_impossible_feedback(self):
+        service = SolverService(self.solver)
+
+        async def run():
+            session = (await service.handle({"op": "new"}))["session"]
+            # No word in the list fits: the session keeps its state
+            rejected = await service.handle({"op": "feedback", "session": session, "guess": "raise", "pattern": "ggggy"})
+            history = len(service.sessions[session].game.history)
+            accepted = await service.handle({"op": "feedback", "session": session, "guess": "raise", "pattern": "ggggg"})
+            return rejected, history, accepted
+
+        rejected, history, accepted = asyncio.run(run())
+        self.assertFalse(rejected["ok"])
+        self.assertEqual(history, 0)
+        self.assertTrue(accepted["ok"])
+
+    def test_rejects_malformed_feedback(self):
+        service = SolverService(self.solver)
+        malformed = [("raises", "xxxxxg"), ("rañse", "xxxxx"), ("rais", "xxxg"), ("raise", "xxxxz"), ("raise", "xxxx")]
+
+        async def run():
+            session = (await service.handle({"op": "new"}))["session"]
+            responses = [await service.handle({"op": "feedback", "session": session, "guess": guess, "pattern": pattern, "id": n})
+                         for n, (guess, pattern) in enumerate(malformed)]
+            return responses, len(service.sessions[session].game.history)
+
+        responses, history = asyncio.run(run())
+        self.assertEqual([(response["ok"], response["id"]) for response in responses], [(False, n) for n in range(len(malformed))])
+        self.assertEqual(history, 0)
+        self.assertEqual(service.latency.summary()["feedback"]["count"], len(malformed))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from entropy import Solver
+from skilltest import evaluate_tree, play, play_parallel, print_statistics
+from test_solver import random_words
+
+
+class TestTreeEvaluation(unittest.TestCase):
+    def test_matches_one_game_per_answer(self):
+        solver = Solver(words=random_words(150, seed=2) + ["raise"])
+        answers = solver.words[::3]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results, failed, nodes_per_depth = evaluate_tree(answers, solver)
+            expected = []
+            for answer in answers:
+                try:
+                    expected.append((play(answer, solver, verbose=False), answer))
+                except SystemExit:
+                    pass
+
+        self.assertEqual(results, expected)
+        self.assertEqual(len(results) + len(failed), len(answers))
+        self.assertEqual(nodes_per_depth[1], 1)
+
+
+class TestParallelEvaluation(unittest.TestCase):
+    def test_matches_sequential_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, "w") as file:
+                file.write("\n".join(random_words(200, seed=7) + ["raise"]))
+            solver = Solver(path)
+            solver.verbose = False
+            answers = solver.words[::4]
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = play_parallel(answers, solver, 2)
+                expected = []
+                for answer in answers:
+                    try:
+                        expected.append((play(answer, solver, verbose=False), answer))
+                    except SystemExit:
+                        break
+
+        self.assertEqual(results, expected)
+        self.assertEqual(len(results), len(answers))
+
+        # Same pairs in the same order: the summary, max/min answers included, is identical
+        summaries = []
+        for pairs in (results, expected):
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                print_statistics(pairs)
+            summaries.append(out.getvalue())
+        self.assertEqual(summaries[0], summaries[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
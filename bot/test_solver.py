@@ -0,0 +1,145 @@
+import contextlib
+import io
+import random
+import types
+import unittest
+from unittest import mock
+
+import entropy as entropy_module
+from entropy import SHORTLIST_SIZE, PatternHistograms, SearchStats, Solver, decode_feedback, entropy, feedback_code
+
+
+def random_words(n, seed=0, alphabet="aeirstlnoc"):
+    rnd = random.Random(seed)
+    words = set()
+    while len(words) < n:
+        words.add("".join(rnd.choice(alphabet) for _ in range(5)))
+    return sorted(words)
+
+
+class TestSolver(unittest.TestCase):
+    def setUp(self):
+        self.solver = Solver(words=random_words(300))
+
+    def test_batched_entropies_match_scalar(self):
+        answers = self.solver.words[::7]
+        batched = self.solver.entropies(self.solver.words, answers)
+        for word, ent in zip(self.solver.words, batched):
+            self.assertAlmostEqual(ent, entropy(word, answers), places=12)
+
+    def test_next_guess_first_max_wins(self):
+        game = self.solver.new_game()
+        game.update(*decode_feedback("raise", feedback_code("raise", self.solver.words[42])))
+        with contextlib.redirect_stdout(io.StringIO()):
+            guess, ent = game.next_guess()
+
+        scores = [self.solver.entropy(word, game.possible_words) for word in self.solver.words]
+        self.assertEqual(guess, self.solver.words[scores.index(max(scores))])
+        self.assertEqual(ent, max(scores))
+
+    def test_game_reaches_answer(self):
+        answer = self.solver.words[123]
+        game = self.solver.new_game()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(10):
+                guess, _ = game.next_guess()
+                if guess == answer:
+                    break
+                game.update(*decode_feedback(guess, feedback_code(guess, answer)))
+        self.assertEqual(guess, answer)
+
+    def test_feedback_code_rejects_non_letters(self):
+        self.assertEqual(feedback_code("crane", "raise"), 38)
+        for guess, answer in (("RAISE", "raise"), ("crane", "rañse"), ("cr4ne", "raise")):
+            with self.assertRaises(ValueError):
+                feedback_code(guess, answer)
+
+    def test_time_budget_search(self):
+        game = self.solver.new_game()
+        game.update(*decode_feedback("raise", feedback_code("raise", self.solver.words[7])))
+        args = (game.possible_words, game.green, game.yellow, game.gray, game.min_required)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            exhaustive = self.solver.next_guess(*args)
+            finished = self.solver.next_guess(*args, time_budget=60)
+            self.assertTrue(self.solver.last_search.completed)
+            self.assertEqual(finished, exhaustive)
+
+            self.solver.next_guess(*args, time_budget=0)
+            self.assertFalse(self.solver.last_search.completed)
+            self.assertLess(self.solver.last_search.evaluated, self.solver.last_search.candidates)
+
+    def test_time_budget_sizes_blocks(self):
+        solver = Solver(words=random_words(3000, seed=4))
+        answers = solver.table.all_ids[::3]
+        candidates_per_second = 1e5
+
+        # A clock that advances with the candidates scored, at a fixed rate
+        clock = [0.0]
+        score = entropy_module.entropies_from_codes
+
+        def timed(codes):
+            clock[0] += len(codes) / candidates_per_second
+            return score(codes)
+
+        stats = SearchStats(len(solver.words))
+        with mock.patch.object(entropy_module, "time", types.SimpleNamespace(time=lambda: clock[0])), \
+                mock.patch.object(entropy_module, "entropies_from_codes", timed):
+            solver._search(solver.table.all_ids, answers, stats, deadline=0.01)
+
+        # One full block would be several thousand candidates; the budget covers 1000
+        self.assertFalse(stats.completed)
+        self.assertLessEqual(stats.evaluated, 0.01 * candidates_per_second + SHORTLIST_SIZE)
+
+    def test_pruned_search_matches_exhaustive(self):
+        pruning = Solver(words=self.solver.words)
+        pruning.prune = True
+        pruned = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for answer in self.solver.words[::37]:
+                game = self.solver.new_game()
+                game.update(*decode_feedback("raise", feedback_code("raise", answer)))
+                args = (game.possible_words, game.green, game.yellow, game.gray, game.min_required)
+                self.assertEqual(pruning.next_guess(*args), self.solver.next_guess(*args))
+                pruned += pruning.last_search.pruned
+        self.assertGreater(pruned, 0)
+
+    def test_distinct_candidates(self):
+        solver = Solver(words=random_words(400, seed=3, alphabet="abcdeo"))
+        answers = [word for word in solver.words if "o" not in word and "c" not in word][:40]
+        distinct = solver.table.subset(solver.distinct_candidates(solver.table.all_ids, solver.ids(answers)))
+        self.assertLess(len(distinct), len(solver.words))
+
+        # Every dropped word partitions the answers like the earlier word kept for it
+        kept = {}
+        for word in distinct:
+            kept.setdefault(word.replace("o", ".").replace("c", "."), word)
+        for word in solver.words:
+            rep = kept[word.replace("o", ".").replace("c", ".")]
+            self.assertLessEqual(solver.words.index(rep), solver.words.index(word))
+            self.assertEqual(solver.feedback_codes(word, answers).tolist(), solver.feedback_codes(rep, answers).tolist())
+
+    def test_incremental_histograms(self):
+        histograms = PatternHistograms(self.solver)
+        answers = self.solver.words[::2]
+        histograms.update(self.solver.ids(answers))
+        # Fewer answers eliminated than kept: the histograms are updated by subtraction
+        survivors = answers[::3] + answers[1::3]
+        scores = histograms.entropies(self.solver.table.all_ids, self.solver.ids(survivors))
+        self.assertEqual(scores.tolist(), self.solver.entropies(self.solver.words, survivors).tolist())
+
+        incremental = Solver(words=self.solver.words)
+        incremental.incremental = True
+        answer = self.solver.words[77]
+        games = [self.solver.new_game(), incremental.new_game()]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(6):
+                guesses = [game.next_guess() for game in games]
+                self.assertEqual(guesses[0], guesses[1])
+                if guesses[0][0] == answer:
+                    break
+                for game in games:
+                    game.apply(guesses[0][0], feedback_code(guesses[0][0], answer))
+
+if __name__ == '__main__':
+    unittest.main()
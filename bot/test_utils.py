@@ -0,0 +1,19 @@
+import unittest
+
+from utils import pattern_to_str, str_to_pattern
+
+
+class TestPatternStrings(unittest.TestCase):
+    def test_round_trip(self):
+        for code in range(3 ** 5):
+            self.assertEqual(str_to_pattern(pattern_to_str(code)), code)
+        self.assertEqual(str_to_pattern("xyxxg", 5), str_to_pattern("XYXXG"))
+
+    def test_rejects_invalid(self):
+        for string, n in (("ggyxz", 5), ("ggyx", 5), ("ggyxxg", 5), ("g y x", None)):
+            with self.assertRaises(ValueError):
+                str_to_pattern(string, n)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from entropy import feedback_code
+from wordindex import WordIndex
+
+
+class TestWordIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = WordIndex(["spend", "spell", "speed", "raise", "sweep"])
+
+    def test_spend_case(self):
+        # Same scenario as test_fix_min_required: gray 's' and 'e' are still required once
+        green = {0: 's', 1: 'p', 2: 'e'}
+        yellow = {'s': {3}, 'e': {4}}
+        gray = {'l', 'r', 'i', 't', 'a'}
+        min_required = {'s': 1, 'e': 1, 'p': 1}
+
+        filtered = self.index.filter(["spend", "spell", "speed"], green, yellow, gray, min_required=min_required)
+        self.assertEqual(filtered, ["spend", "speed"])
+
+    def test_gray_letter_caps_count(self):
+        # One 'e' is required and 'e' was also gray: words with two e's are out
+        filtered = self.index.filter(self.index.words, {2: 'e'}, {}, {'e'}, min_required={'e': 1})
+        self.assertEqual(filtered, ["spend", "spell"])
+
+    def test_inferred_min_required(self):
+        self.assertEqual(self.index.count({}, {'e': {4}}, set()), 4)
+
+    def test_pattern_bounds(self):
+        answer_ids = [0, 1, 3]
+        bounds = self.index.pattern_bounds(answer_ids)
+        for guess, bound in zip(self.index.words, bounds):
+            patterns = {feedback_code(guess, self.index.words[i]) for i in answer_ids}
+            self.assertLessEqual(len(patterns), bound)
+
+    def test_unknown_word(self):
+        self.assertIsNone(self.index.filter(["zzzzz"], {}, {}, set()))
+
+    def test_rejects_letters_outside_a_z(self):
+        for green, gray in (({0: 'R'}, {'t'}), ({0: 'A'}, set()), ({}, {'ñ'}), ({0: 's'}, {'1'})):
+            with self.assertRaises(ValueError):
+                self.index.mask(green, {}, gray)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from entropy import Solver
+from utils import load_words
+from wordlist import CompiledWordList, clean_words, compile_word_list
+
+
+class TestCompiledWordList(unittest.TestCase):
+    def test_clean_words(self):
+        self.assertEqual(clean_words(["Raise\n", "speed\n", "\n", "RAISE\n"]), ["raise", "speed"])
+        with self.assertRaises(ValueError):
+            clean_words(["raise\n", "spee\n"])
+        with self.assertRaises(ValueError):
+            clean_words(["rai5e\n"])
+
+    def test_compile_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "words.txt")
+            with open(source, "w") as file:
+                file.write("raise\nabide\nspeed\nabide\ncrane\n")
+
+            output = compile_word_list(source, patterns=True)
+            self.assertEqual(load_words(output), ["raise", "abide", "speed", "crane"])
+
+            compiled = Solver(output)
+            text = Solver(words=["raise", "abide", "speed", "crane"])
+            self.assertTrue((compiled.patterns == text.patterns).all())
+            self.assertTrue((compiled.table.counts == text.table.counts).all())
+            self.assertTrue((compiled.table.presence == text.table.presence).all())
+            del compiled
+
+    def test_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.wlc")
+            with open(path, "wb") as file:
+                file.write(b"raise\nabide\n" * 10)
+            with self.assertRaises(ValueError):
+                CompiledWordList(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from wordtable import WordTable
+
+
+class TestWordTable(unittest.TestCase):
+    def setUp(self):
+        self.table = WordTable(["spend", "spell", "speed", "raise", "sweep"])
+
+    def test_arrays(self):
+        self.assertEqual(self.table.letters.shape, (5, 5))
+        self.assertEqual(self.table.counts[self.table.ids["speed"], ord("e") - 97], 2)
+        self.assertEqual(self.table.counts[self.table.ids["spell"]].sum(), 5)
+
+        raise_bits = self.table.presence[self.table.ids["raise"]]
+        self.assertEqual(raise_bits, sum(1 << (ord(c) - 97) for c in "raise"))
+
+    def test_views(self):
+        ids = self.table.index_of(["sweep", "spend"])
+        self.assertEqual(ids.tolist(), [4, 0])
+        self.assertEqual(self.table.subset(ids), ["sweep", "spend"])
+        self.assertIsNone(self.table.index_of(["zzzzz"]))
+        self.assertEqual(self.table.letters_present(ids), self.table.presence[4] | self.table.presence[0])
+
+    def test_all_ids_shared_read_only(self):
+        with self.assertRaises(ValueError):
+            self.table.all_ids[0] = 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,11 @@
 from skilltest import play
-from entropy import WORDS
+from entropy import Solver, make_parser
 
 if __name__ == '__main__':
+    solver = Solver.from_args(make_parser().parse_args())
     test_word = input("Enter the test word: ").strip().lower()
-    if test_word not in WORDS:
+    if test_word not in solver.word_ids:
         print(f"Word '{test_word}' is not in the valid words list.")
     else:
-        guesses = play(test_word)
-        print(f"Solved the word '{test_word}' in {guesses} guesses.")
\ No newline at end of file
+        guesses = play(test_word, solver)
+        print(f"Solved the word '{test_word}' in {guesses} guesses.")
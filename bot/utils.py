@@ -1,5 +1,13 @@
+from wordlist import CompiledWordList, is_compiled
+
+
 def load_words(file_path: str) -> list[str]:
-    """Load words from a given file and return them as a list."""
+    """
+    Load words from a given file and return them as a list.
+    A compiled word list (see wordlist.py) is memory-mapped instead of parsed.
+    """
+    if is_compiled(file_path):
+        return CompiledWordList(file_path).words
     with open(file_path, 'r') as file:
         words = [line.strip() for line in file.readlines()]
     return words
@@ -15,6 +23,20 @@ def pattern_to_str(code, n=5):
     # digits are in reverse (least-significant first)
     return ''.join(reversed(digits))
 
+def str_to_pattern(string: str, n: int | None = None) -> int:
+    """
+    Convert a feedback string like 'GYXXG' (either case) to its integer base-3 code,
+    the inverse of pattern_to_str. Raises ValueError unless it is n characters
+    (when n is given) of G, Y and X.
+    """
+    string = string.lower()
+    if (n is not None and len(string) != n) or any(ch not in 'xyg' for ch in string):
+        raise ValueError(f"Invalid pattern string {string!r}: use one of g, y and x per letter")
+    code = 0
+    for ch in string:
+        code = code * 3 + 'xyg'.index(ch)
+    return code
+
 def str_to_gyx(string: str):
     """Convert a string like 'GYXXG' to a list of greens, yellows, and greys."""
     
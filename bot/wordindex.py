@@ -0,0 +1,128 @@
+from collections import Counter
+
+import numpy as np
+
+from wordtable import WordTable
+
+
+def letter_index(letter: str) -> int:
+    """The 0..25 slot of a lowercase letter a-z; raises ValueError for anything else."""
+    k = ord(letter) - 97 if isinstance(letter, str) and len(letter) == 1 else -1
+    if not 0 <= k < 26:
+        raise ValueError(f"{letter!r} is not a letter a-z")
+    return k
+
+
+class WordIndex:
+    """
+    Constraint index over a fixed word list, built once at load time.
+    Holds per-(position, letter) and per-(letter, min-count) bitmasks as
+    NumPy bool arrays, so a green/yellow/gray/min_required constraint set is
+    answered with a handful of AND/ANDNOT operations over the whole list.
+    """
+
+    def __init__(self, words: "list[str] | WordTable"):
+        self.table = words if isinstance(words, WordTable) else WordTable(words)
+        self.words = self.table.words
+        self.ids = self.table.ids
+        self.letters = letters = self.table.letters
+        n_words, self.length = letters.shape
+
+        # at[pos, letter]: word has letter at pos
+        self.at = np.zeros((self.length, 26, n_words), dtype=bool)
+        for pos in range(self.length):
+            self.at[pos, letters[:, pos], np.arange(n_words)] = True
+
+        # count_ge[letter, k]: word contains letter at least k times (k = 0..length)
+        counts = self.table.counts.T
+        self.count_ge = counts[:, None, :] >= np.arange(self.length + 1)[None, :, None]
+
+    def _at_least(self, letter: str, req: int) -> np.ndarray:
+        """Mask of words containing letter at least req times (req >= 1)."""
+        if req > self.length:
+            return np.zeros(len(self.words), dtype=bool)
+        return self.count_ge[letter_index(letter), req]
+
+    def mask(self, green, yellow, gray, min_required=None) -> np.ndarray:
+        """
+        Return the bool mask of words satisfying the constraints.
+        Same semantics as entropy.is_guess_valid:
+        - green: dict of position -> letter
+        - yellow: dict of letter -> set of positions
+        - gray: set of letters
+        - min_required: dict of letter -> min count (inferred from green/yellow if None)
+        Letters must be lowercase a-z (ValueError otherwise).
+        """
+
+        mask = np.ones(len(self.words), dtype=bool)
+
+        for pos, letter in green.items():
+            mask &= self.at[pos, letter_index(letter)]
+
+        if min_required is None:
+            inferred = Counter()
+            for _, letter in green.items():
+                inferred[letter] += 1
+            for letter in yellow:
+                if letter not in inferred:
+                    inferred[letter] = 1
+            min_required = inferred
+
+        for letter, req in min_required.items():
+            if req > 0:
+                mask &= self._at_least(letter, req)
+
+        for letter, positions in yellow.items():
+            for pos in positions:
+                mask &= ~self.at[pos, letter_index(letter)]
+
+        # A gray letter must not appear at all unless it is required, in which
+        # case the word must not contain more copies than required
+        for letter in gray:
+            req = min_required.get(letter, 0)
+            if req == 0:
+                mask &= ~self._at_least(letter, 1)
+            elif req > 0:
+                mask &= ~self._at_least(letter, req + 1)
+
+        return mask
+
+    def count(self, green, yellow, gray, min_required=None) -> int:
+        """Number of words in the whole list satisfying the constraints."""
+        return int(np.count_nonzero(self.mask(green, yellow, gray, min_required)))
+
+    def filter(self, possible_words, green, yellow, gray, min_required=None) -> list[str] | None:
+        """
+        Filter possible_words (in order) by the constraints.
+        Returns None if some word is not part of the index.
+        """
+
+        try:
+            ids = np.fromiter((self.ids[word] for word in possible_words), dtype=np.intp, count=len(possible_words))
+        except KeyError:
+            return None
+
+        keep = self.mask(green, yellow, gray, min_required)[ids]
+        return [possible_words[i] for i in np.flatnonzero(keep)]
+
+    def filter_ids(self, ids: np.ndarray, green, yellow, gray, min_required=None) -> np.ndarray:
+        """Filter an index array (in order) by the constraints."""
+        return ids[self.mask(green, yellow, gray, min_required)[ids]]
+
+    def pattern_bounds(self, answer_ids: np.ndarray) -> np.ndarray:
+        """
+        Upper bound, for every word of the list as a guess, on the number of
+        distinct feedback patterns it can produce against the answers answer_ids.
+        A position can only come back green if some answer has the guess's
+        letter there, yellow if some answer has it elsewhere, and gray if some
+        answer lacks it there; the bound is the product over positions.
+        """
+
+        at = self.at[:, :, answer_ids]
+        counts = self.count_ge[:, 1:, answer_ids].sum(axis=1)
+
+        options = at.any(axis=2).astype(np.int64)
+        options += (counts[None, :, :] > at).any(axis=2)
+        options += ~at.all(axis=2)
+
+        return options[np.arange(self.length), self.letters].prod(axis=1)
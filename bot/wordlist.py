@@ -0,0 +1,159 @@
+import argparse
+import os
+import struct
+
+import numpy as np
+
+from patterns import compute_patterns, word_list_hash
+from wordtable import WordTable
+
+# Extension of compiled word lists; load_words reads anything else as text
+COMPILED_SUFFIX = ".wlc"
+
+MAGIC = b"WORDLIST"
+
+# Bumped whenever the file layout changes
+FORMAT_VERSION = 1
+
+# magic, version, words, letters per word, flags, sha1 of the list (see word_list_hash)
+HEADER = struct.Struct("<8sIIII40s")
+
+# Flags: which optional tables follow the letter array
+HAS_TABLES = 1    # letter counts and presence masks (see WordTable)
+HAS_PATTERNS = 2  # the full pattern matrix (see patterns.load_pattern_matrix)
+
+# Every array starts on a multiple of this many bytes
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def clean_words(lines: list[str]) -> list[str]:
+    """
+    Validate the lines of a text word list and return its words: stripped,
+    lowercased, blank lines skipped and duplicates dropped (first one kept).
+    Raises ValueError naming the first line that is not a word of a-z letters
+    of the same length as the first word.
+    """
+
+    words = []
+    seen = set()
+    length = None
+    for number, line in enumerate(lines, start=1):
+        word = line.strip().lower()
+        if not word:
+            continue
+        if not word.isascii() or not word.isalpha():
+            raise ValueError(f"line {number}: {line.strip()!r} is not a word of letters a-z")
+        if length is None:
+            length = len(word)
+        elif len(word) != length:
+            raise ValueError(f"line {number}: {word!r} has {len(word)} letters, expected {length}")
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+
+    if not words:
+        raise ValueError("the word list is empty")
+    return words
+
+
+class CompiledWordList:
+    """
+    A compiled word list, memory-mapped: the packed letter array plus any
+    optional tables stored with it. Nothing is parsed beyond the header.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path}: not a compiled word list")
+
+        magic, version, n_words, length, self.flags, digest = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a compiled word list")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: compiled word list version {version}, expected {FORMAT_VERSION} (recompile it)")
+
+        self.hash = digest.decode("ascii")
+        self.counts = self.presence = self.patterns = None
+
+        offset = _align(HEADER.size)
+        self.letters = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=(n_words, length))
+        offset = _align(offset + n_words * length)
+
+        if self.flags & HAS_TABLES:
+            self.counts = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=(n_words, 26))
+            offset = _align(offset + n_words * 26)
+            self.presence = np.memmap(path, dtype="<u4", mode="r", offset=offset, shape=(n_words,))
+            offset = _align(offset + n_words * 4)
+
+        if self.flags & HAS_PATTERNS:
+            self.patterns = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=(n_words, n_words))
+
+    def __len__(self) -> int:
+        return self.letters.shape[0]
+
+    @property
+    def words(self) -> list[str]:
+        """Decode the letter array back into the word list."""
+        n_words, length = self.letters.shape
+        text = (self.letters + ord("a")).astype(np.uint8).tobytes().decode("ascii")
+        return [text[i:i + length] for i in range(0, n_words * length, length)]
+
+
+def compile_word_list(source: str, output: str | None = None, patterns: bool = False) -> str:
+    """
+    Validate and de-duplicate the text word list at source and write it in the
+    compiled format (default: next to it, with COMPILED_SUFFIX). Letter counts
+    and presence masks are always stored; the pattern matrix only if patterns.
+    Returns the output path.
+    """
+
+    with open(source, "r") as file:
+        words = clean_words(file.readlines())
+
+    if output is None:
+        output = os.path.splitext(source)[0] + COMPILED_SUFFIX
+
+    table = WordTable(words)
+    flags = HAS_TABLES | (HAS_PATTERNS if patterns else 0)
+    arrays = [table.letters, table.counts, table.presence.astype("<u4")]
+    if patterns:
+        arrays.append(compute_patterns(table.letters, table.letters))
+
+    # Write to a temporary file first so a half-written list is never loaded
+    tmp_path = output + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(words), table.length, flags, word_list_hash(words).encode("ascii")))
+        for array in arrays:
+            file.write(b"\0" * (_align(file.tell()) - file.tell()))
+            file.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp_path, output)
+
+    return output
+
+
+def is_compiled(path: str) -> bool:
+    return path.endswith(COMPILED_SUFFIX)
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Compile a text word list into the binary format")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_cmd = commands.add_parser("compile", help="Validate, de-duplicate and compile a text word list")
+    compile_cmd.add_argument("source", help="Text word list, one word per line")
+    compile_cmd.add_argument("-o", "--output", type=str, default=None, help=f"Output path (default: the source with {COMPILED_SUFFIX})")
+    compile_cmd.add_argument("--patterns", action="store_true", help="Also store the full pattern matrix")
+
+    args = parser.parse_args()
+    output = compile_word_list(args.source, args.output, patterns=args.patterns)
+    compiled = CompiledWordList(output)
+    print(f"Compiled {len(compiled)} words to {output} (sha1 {compiled.hash[:16]})")
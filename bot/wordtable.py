@@ -0,0 +1,65 @@
+import numpy as np
+
+from patterns import encode_words
+
+
+class WordTable:
+    """
+    A word list stored as arrays, built once per list and shared by every game.
+    Subsets of the list (candidates, remaining answers) are index arrays into
+    the table rather than lists of strings.
+    """
+
+    def __init__(self, words: list[str], letters: np.ndarray | None = None, counts: np.ndarray | None = None, presence: np.ndarray | None = None):
+        """
+        :param words: The word list
+        :param letters, counts, presence: The arrays below, if already computed
+            (for example memory-mapped from a compiled word list)
+        """
+
+        self.words = words
+        self.ids = {word: idx for idx, word in enumerate(words)}
+
+        # letters[i, pos]: letter of word i at pos, 0..25
+        self.letters = letters if letters is not None else encode_words(words)
+
+        # counts[i, letter]: occurrences of letter in word i
+        if counts is None:
+            counts = np.zeros((len(words), 26), dtype=np.uint8)
+            for pos in range(self.letters.shape[1]):
+                np.add.at(counts, (np.arange(len(words)), self.letters[:, pos]), 1)
+        self.counts = counts
+
+        # presence[i]: bit k set if word i contains letter k
+        if presence is None:
+            presence = ((counts > 0).astype(np.uint32) << np.arange(26, dtype=np.uint32)).sum(axis=1, dtype=np.uint32)
+        self.presence = presence
+
+        # The whole list as an index array; read-only so games can share it
+        self.all_ids = np.arange(len(words), dtype=np.intp)
+        self.all_ids.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @property
+    def length(self) -> int:
+        """Number of letters per word."""
+        return self.letters.shape[1]
+
+    def index_of(self, words) -> np.ndarray | None:
+        """Map words to their indices in the table, or None if any word is not in the table."""
+        ids = self.ids
+        try:
+            return np.fromiter((ids[word] for word in words), dtype=np.intp, count=len(words))
+        except KeyError:
+            return None
+
+    def subset(self, ids: np.ndarray) -> list[str]:
+        """The words at ids, in order."""
+        words = self.words
+        return [words[i] for i in ids.tolist()]
+
+    def letters_present(self, ids: np.ndarray) -> int:
+        """Bitmask of the letters that appear in at least one of the words at ids."""
+        return int(np.bitwise_or.reduce(self.presence[ids])) if len(ids) else 0